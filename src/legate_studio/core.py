@@ -14,7 +14,9 @@ from datetime import datetime, timedelta
 from functools import wraps
 from pathlib import Path
 
+import orjson
 from flask import Flask, flash, jsonify, redirect, render_template, request, session, url_for
+from flask.json.provider import DefaultJSONProvider
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from werkzeug.middleware.proxy_fix import ProxyFix
@@ -44,6 +46,34 @@ limiter = Limiter(
 )
 
 
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson.
+
+    Output matches the default provider: sorted keys, non-str keys coerced,
+    and dates/Decimals/UUIDs routed through Flask's default() so dates stay
+    HTTP-date strings. Calls with stdlib-only kwargs fall back to json.
+
+    Unlike the stdlib encoder, non-ASCII is emitted as UTF-8 rather than
+    escaped, NaN/Infinity become null, and ints wider than 64 bits raise
+    TypeError.
+    """
+
+    _options = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def dumps(self, obj, **kwargs) -> str:
+        indent = kwargs.pop("indent", None)
+        kwargs.pop("separators", None)  # orjson output is always compact
+        if kwargs:
+            return super().dumps(obj, indent=indent, **kwargs)
+        option = self._options | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+
 def touch_activity():
     """Update last activity timestamp (called on user interactions)."""
     global _last_activity_time
@@ -146,6 +176,8 @@ def create_app():
         static_url_path="/static",
     )
 
+    app.json = OrjsonProvider(app)
+
     # Apply proxy fix for Fly.io (trust X-Forwarded-* headers)
     app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1, x_proto=1, x_host=1, x_prefix=1)
 
@@ -50,6 +50,7 @@ def submit_job():
     """
     from .core import get_api_key_for_user
     from .rag.database import init_db
+    from .worker import MotifWorker
 
     user = session.get("user", {})
     user_id = user.get("user_id")
@@ -130,6 +131,7 @@ def submit_job():
             (job_id, user_id, transcript, source_id),
         )
         db.commit()
+        MotifWorker.notify_new_job()
 
         logger.info(f"Job {job_id} queued for user {user_id}")
 
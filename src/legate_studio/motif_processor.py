@@ -19,6 +19,9 @@ import logging
 import re
 import secrets
 import sqlite3
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -177,6 +180,51 @@ Generate slugs that are:
 - Example: "oracle-machines-intuition" not "my-thought-about-ai"
 """
 
+# AI SDK clients hold pooled HTTPS connections, so they are shared across jobs and
+# worker threads (the SDK clients are thread-safe) instead of being rebuilt, with a
+# fresh TLS handshake, on every call. Keyed by (provider, api_key); LRU-bounded.
+AI_CLIENT_CACHE_SIZE = 64
+
+_ai_clients: OrderedDict[tuple[str, str], object] = OrderedDict()
+_ai_clients_lock = threading.Lock()
+
+
+def _get_ai_client(provider: str, api_key: str):
+    """Return a cached SDK client for a provider and API key, creating it if needed.
+
+    Args:
+        provider: One of "anthropic", "gemini", "openai"
+        api_key: The API key the client authenticates with
+
+    Returns:
+        anthropic.Anthropic, genai.Client or openai.OpenAI instance
+    """
+    key = (provider, api_key)
+    with _ai_clients_lock:
+        client = _ai_clients.get(key)
+        if client is not None:
+            _ai_clients.move_to_end(key)
+            return client
+
+    if provider == "gemini":
+        from google import genai
+
+        client = genai.Client(api_key=api_key)
+    elif provider == "openai":
+        import openai
+
+        client = openai.OpenAI(api_key=api_key)
+    else:
+        import anthropic
+
+        client = anthropic.Anthropic(api_key=api_key)
+
+    with _ai_clients_lock:
+        client = _ai_clients.setdefault(key, client)
+        while len(_ai_clients) > AI_CLIENT_CACHE_SIZE:
+            _ai_clients.popitem(last=False)
+    return client
+
 
 class MotifProcessor:
     """Processes a transcript through all stages."""
@@ -184,6 +232,9 @@ class MotifProcessor:
     def __init__(self, job_id: str, user_id: str, app=None):
         """Initialize the processor.
 
+        Processors hold per-job state and are cheap to build; the expensive
+        AI SDK clients are shared across processors via _get_ai_client().
+
         Args:
             job_id: The processing job ID
             user_id: The user's ID (for API keys and DB access)
@@ -785,9 +836,7 @@ Generate the complete markdown artifact with frontmatter."""
 
     def _call_anthropic(self, system: str, user: str, api_key: str) -> str:
         """Make a call to Claude (Anthropic) API."""
-        import anthropic
-
-        client = anthropic.Anthropic(api_key=api_key)
+        client = _get_ai_client("anthropic", api_key)
 
         response = client.messages.create(
             model=CLAUDE_MODEL,
@@ -800,10 +849,9 @@ Generate the complete markdown artifact with frontmatter."""
 
     def _call_gemini(self, system: str, user: str, api_key: str) -> str:
         """Make a call to Gemini API (using google-genai SDK)."""
-        from google import genai
         from google.genai import types
 
-        client = genai.Client(api_key=api_key)
+        client = _get_ai_client("gemini", api_key)
         response = client.models.generate_content(
             model="gemini-2.0-flash",
             contents=user,
@@ -817,9 +865,7 @@ Generate the complete markdown artifact with frontmatter."""
 
     def _call_openai(self, system: str, user: str, api_key: str) -> str:
         """Make a call to OpenAI API."""
-        import openai
-
-        client = openai.OpenAI(api_key=api_key)
+        client = _get_ai_client("openai", api_key)
         response = client.chat.completions.create(
             model="gpt-4o-mini",
             max_tokens=4096,
@@ -1015,8 +1061,6 @@ def process_motif_sync(transcript: str, user_id: str, source_id: str = None) ->
     Returns:
         Dict with job_id, status, entry_ids, etc.
     """
-    from datetime import datetime, timedelta
-
     from .rag.database import init_db
 
     job_id = f"job-{secrets.token_hex(8)}"
@@ -1024,7 +1068,7 @@ def process_motif_sync(transcript: str, user_id: str, source_id: str = None) ->
     # Create job record with locked_until set to prevent background worker from claiming
     # (worker checks for locked_until IS NULL OR locked_until < now to identify crashed jobs)
     db = init_db()
-    lock_until = (datetime.utcnow() + timedelta(minutes=10)).isoformat()
+    lock_until = time.time() + 600  # unix epoch seconds, 10 minutes out
     db.execute(
         """
         INSERT INTO processing_jobs
@@ -66,7 +66,9 @@ def get_user_db_path(user_id: str) -> Path:
 def get_connection(db_path: Path | None = None) -> sqlite3.Connection:
     """Get a database connection with proper settings."""
     path = db_path or get_db_path()
-    conn = sqlite3.connect(str(path), check_same_thread=False, timeout=30.0)
+    # Long-lived worker connections cycle through a fixed set of statements; a
+    # larger cache keeps them all prepared alongside the rest of the app's queries
+    conn = sqlite3.connect(str(path), check_same_thread=False, timeout=30.0, cached_statements=256)
     conn.row_factory = sqlite3.Row
 
     # Enable foreign keys and WAL mode for better concurrency
@@ -481,6 +483,13 @@ def init_db(db_path: Path | None = None, user_id: str | None = None) -> sqlite3.
         except sqlite3.OperationalError:
             pass  # Column already exists
 
+    # Migration: locked_until holds numeric unix epoch seconds so the worker can
+    # bind time.time() directly; convert any ISO-8601 text left by older workers
+    cursor.execute(
+        "UPDATE processing_jobs SET locked_until = strftime('%s', locked_until) + 0.0"
+        " WHERE typeof(locked_until) = 'text'"
+    )
+
     # Processing threads table - tracks individual threads within a job
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS processing_threads (
@@ -524,6 +533,13 @@ def init_db(db_path: Path | None = None, user_id: str | None = None) -> sqlite3.
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_processing_threads_job ON processing_threads(job_id)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_processing_threads_status ON processing_threads(job_id, status)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_processing_jobs_locked ON processing_jobs(status,locked_until)")
+    # Covers the worker's claim subquery (status, ORDER BY created_at, lock expiry, rowid)
+    # so it is answered from the index alone, however many finished jobs pile up.
+    # A partial index would be smaller, but SQLite's planner won't pick one for
+    # the claim's OR predicate.
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_processing_jobs_claim ON processing_jobs(status, created_at, locked_until)"
+    )
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_processing_jobs_user ON processing_jobs(user_id)")
 
     # ============ Multi-Tenant Tables ============
@@ -19,32 +19,43 @@ Usage:
 """
 
 import argparse
+import base64
 import hashlib
+import itertools
 import json
 import logging
 import os
+import queue
 import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from requests.auth import AuthBase
 
 logger = logging.getLogger(__name__)
 
 
-def get_default_branch(repo: str, headers: dict) -> str:
+def get_default_branch(repo: str, auth: "TokenPool") -> str:
     """Get the default branch for a repository.
 
     Args:
         repo: Full repo name (owner/repo)
-        headers: GitHub API headers with auth
+        auth: TokenPool used to authenticate the request
 
     Returns:
         Default branch name (e.g., 'main' or 'master')
     """
     try:
-        resp = requests.get(f"https://api.github.com/repos/{repo}", headers=headers, timeout=10)
+        resp = _http.get(f"https://api.github.com/repos/{repo}", headers=GITHUB_HEADERS, auth=auth, timeout=10)
         if resp.ok:
             return resp.json().get("default_branch", "main")
     except Exception as e:
@@ -52,6 +63,318 @@ def get_default_branch(repo: str, headers: dict) -> str:
     return "main"  # fallback
 
 
+# ============ Concurrency ============
+
+# Per-file reads run in parallel; commits to the Library go one at a time
+# because concurrent Contents API PUTs race on the branch ref (409s) and
+# GitHub's secondary limit allows ~80 content-creating requests per minute.
+RECOVERY_MAX_WORKERS = 8
+RECOVERY_WRITES_PER_SECOND = 1.0
+
+# Bound on files buffered between pipeline stages in rebuild_content_hashes
+PIPELINE_QUEUE_SIZE = 32
+_PIPELINE_DONE = object()
+
+
+class _RateLimiter:
+    """Token bucket that blocks callers until a token is available."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            if self._tokens < 1:
+                time.sleep((1 - self._tokens) / self.rate)
+                self._last = time.monotonic()
+                self._tokens = 0.0
+            else:
+                self._tokens -= 1
+
+
+# One pooled session for every GitHub call so parallel per-file fetches reuse
+# kept-alive TLS connections instead of handshaking per request.
+_http = requests.Session()
+_http.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=RECOVERY_MAX_WORKERS * 2))
+
+_write_limiter = _RateLimiter(RECOVERY_WRITES_PER_SECOND)
+_write_lock = threading.Lock()
+
+
+def _map_files(process, paths: list[str]) -> list:
+    """Run a per-file recovery function across paths, preserving order."""
+    with ThreadPoolExecutor(max_workers=RECOVERY_MAX_WORKERS) as executor:
+        return list(executor.map(process, paths))
+
+
+# ============ GitHub Auth ============
+
+GITHUB_HEADERS = {"Accept": "application/vnd.github+json"}
+
+
+class TokenPool(AuthBase):
+    """Round-robin GitHub tokens across requests.
+
+    Used as a requests auth hook so every outgoing call picks the next token.
+    Tokens that report X-RateLimit-Remaining: 0 are skipped until their reset
+    time; if every token is exhausted, the one that resets soonest is used.
+    """
+
+    def __init__(self, tokens: list[str]):
+        self.tokens = [t.strip() for t in tokens if t and t.strip()]
+        if not self.tokens:
+            raise ValueError("No GitHub token provided. Set SYSTEM_PATS or SYSTEM_PAT, or use --token")
+        self._cycle = itertools.cycle(self.tokens)
+        self._exhausted_until: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "TokenPool":
+        """Build a pool from comma-separated SYSTEM_PATS, falling back to SYSTEM_PAT."""
+        tokens = os.environ.get("SYSTEM_PATS", "").split(",")
+        if not any(t.strip() for t in tokens):
+            tokens = [os.environ.get("SYSTEM_PAT", "")]
+        return cls(tokens)
+
+    def next(self) -> str:
+        """Return the next token that isn't rate limited."""
+        with self._lock:
+            now = time.time()
+            for _ in range(len(self.tokens)):
+                token = next(self._cycle)
+                if self._exhausted_until.get(token, 0) <= now:
+                    return token
+            return min(self.tokens, key=lambda t: self._exhausted_until[t])
+
+    def record(self, token: str, response: requests.Response):
+        """Mark a token exhausted when GitHub says it has no requests left."""
+        if response.headers.get("X-RateLimit-Remaining") != "0":
+            return
+        reset_at = float(response.headers.get("X-RateLimit-Reset", time.time() + 60))
+        with self._lock:
+            self._exhausted_until[token] = reset_at
+        logger.warning(f"GitHub token ...{token[-4:]} rate limited until {datetime.utcfromtimestamp(reset_at)}Z")
+
+    def __call__(self, request):
+        token = self.next()
+        request.headers["Authorization"] = f"Bearer {token}"
+        request.register_hook("response", lambda response, **kwargs: self.record(token, response))
+        return request
+
+
+_default_pool: TokenPool | None = None
+_default_pool_lock = threading.Lock()
+
+
+def _token_pool(token: "str | TokenPool | None" = None) -> TokenPool:
+    """Resolve a step's token argument to a TokenPool.
+
+    A pool is used as-is, a single token becomes a pool of one, and None
+    uses a process-wide pool built from the environment.
+    """
+    global _default_pool
+
+    if isinstance(token, TokenPool):
+        return token
+    if token:
+        return TokenPool([token])
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = TokenPool.from_env()
+        return _default_pool
+
+
+# ============ Library Snapshot ============
+
+GRAPHQL_URL = "https://api.github.com/graphql"
+
+# How many folder levels below the repo root the snapshot query expands.
+# Library notes live at {category}/{file}.md, so this leaves plenty of headroom.
+SNAPSHOT_TREE_DEPTH = 4
+
+
+def _is_library_markdown(path: str) -> bool:
+    """Whether a repo path is a Library note that recovery should touch."""
+    return path.endswith(".md") and not path.startswith(".") and path != "README.md"
+
+
+def _snapshot_tree_fields(depth: int) -> str:
+    """Build the nested GraphQL selection for a tree `depth` levels deep."""
+    blob = "... on Blob { oid text isBinary isTruncated }"
+    if depth == 0:
+        return f"entries {{ name type object {{ {blob} }} }}"
+    return f"entries {{ name type object {{ {blob} ... on Tree {{ {_snapshot_tree_fields(depth - 1)} }} }} }}"
+
+
+def _graphql_snapshot(repo: str, auth: TokenPool) -> dict[str, dict]:
+    """Fetch every Library markdown file in a single GraphQL request.
+
+    Args:
+        repo: Full repo name (owner/repo)
+        auth: TokenPool used to authenticate the request
+
+    Returns:
+        Dict mapping path to {"content": str | None, "sha": str}. Content is
+        None for blobs GitHub would not inline (binary or truncated); callers
+        fall back to the REST contents API for those.
+
+    Raises:
+        ValueError: If the repo is empty or nested deeper than SNAPSHOT_TREE_DEPTH
+    """
+    owner, name = repo.split("/", 1)
+    query = (
+        "query($owner: String!, $name: String!) {"
+        " repository(owner: $owner, name: $name) {"
+        f' object(expression: "HEAD:") {{ ... on Tree {{ {_snapshot_tree_fields(SNAPSHOT_TREE_DEPTH)} }} }}'
+        " } }"
+    )
+    response = _http.post(
+        GRAPHQL_URL,
+        auth=auth,
+        json={"query": query, "variables": {"owner": owner, "name": name}},
+        timeout=60,
+    )
+    response.raise_for_status()
+    payload = response.json()
+    if payload.get("errors"):
+        raise ValueError(f"GraphQL error: {payload['errors'][0].get('message')}")
+
+    root = ((payload.get("data") or {}).get("repository") or {}).get("object")
+    if not root:
+        raise ValueError(f"Repository {repo} has no HEAD tree")
+
+    snapshot = {}
+
+    def walk(entries: list[dict], prefix: str):
+        for entry in entries:
+            path = f"{prefix}{entry['name']}"
+            obj = entry.get("object") or {}
+            if entry["type"] == "tree":
+                if "entries" not in obj:
+                    raise ValueError(f"Library tree deeper than snapshot depth at {path}")
+                walk(obj["entries"], f"{path}/")
+            elif entry["type"] == "blob" and _is_library_markdown(path):
+                inline = not obj.get("isBinary") and not obj.get("isTruncated")
+                snapshot[path] = {"content": obj.get("text") if inline else None, "sha": obj["oid"]}
+
+    walk(root["entries"], "")
+    logger.info(f"Snapshot of {repo}: {len(snapshot)} markdown files")
+    return snapshot
+
+
+def _tree_snapshot(repo: str, auth: TokenPool) -> dict[str, dict]:
+    """List Library markdown files and their blob SHAs from the recursive tree API.
+
+    Fallback for when the GraphQL snapshot is unavailable. Content is left as
+    None, so reads go through the blob cache by SHA.
+    """
+    branch = get_default_branch(repo, auth)
+    tree_url = f"https://api.github.com/repos/{repo}/git/trees/{branch}?recursive=1"
+    response = _http.get(tree_url, headers=GITHUB_HEADERS, auth=auth, timeout=30)
+    response.raise_for_status()
+
+    return {
+        item["path"]: {"content": None, "sha": item["sha"]}
+        for item in response.json().get("tree", [])
+        if item["type"] == "blob" and _is_library_markdown(item["path"])
+    }
+
+
+# Blobs are content-addressed, so a SHA's bytes never change and can be kept
+# for the life of the process. ~4k notes at ~10 KB each bounds this near 40 MB.
+BLOB_CACHE_SIZE = 4096
+
+_blob_cache: OrderedDict[tuple[str, str], bytes] = OrderedDict()
+_blob_cache_lock = threading.Lock()
+
+
+def _remember_blob(repo: str, sha: str, data: bytes):
+    """Store blob bytes under their SHA, evicting the least recently used."""
+    with _blob_cache_lock:
+        _blob_cache[(repo, sha)] = data
+        _blob_cache.move_to_end((repo, sha))
+        while len(_blob_cache) > BLOB_CACHE_SIZE:
+            _blob_cache.popitem(last=False)
+
+
+def _fetch_blob(repo: str, sha: str, auth: TokenPool) -> bytes:
+    """Fetch a blob's bytes by SHA, served from the LRU cache when seen before."""
+    with _blob_cache_lock:
+        data = _blob_cache.get((repo, sha))
+        if data is not None:
+            _blob_cache.move_to_end((repo, sha))
+            return data
+
+    response = _http.get(
+        f"https://api.github.com/repos/{repo}/git/blobs/{sha}",
+        headers=GITHUB_HEADERS,
+        auth=auth,
+        timeout=30,
+    )
+    response.raise_for_status()
+
+    data = base64.b64decode(response.json()["content"])
+    _remember_blob(repo, sha, data)
+    return data
+
+
+def _read_file(repo: str, path: str, auth: TokenPool, snapshot: dict | None = None) -> tuple[str, str]:
+    """Read a file's text and blob SHA, preferring the snapshot over the REST API."""
+    cached = (snapshot or {}).get(path)
+    if cached:
+        if cached["content"] is not None:
+            return cached["content"], cached["sha"]
+        return _fetch_blob(repo, cached["sha"], auth).decode("utf-8"), cached["sha"]
+
+    content_url = f"https://api.github.com/repos/{repo}/contents/{path}"
+    response = _http.get(content_url, headers=GITHUB_HEADERS, auth=auth, timeout=30)
+    response.raise_for_status()
+
+    file_data = response.json()
+    return base64.b64decode(file_data["content"]).decode("utf-8"), file_data["sha"]
+
+
+def _write_file(
+    repo: str,
+    path: str,
+    content: str,
+    sha: str,
+    message: str,
+    auth: TokenPool,
+    snapshot: dict | None = None,
+):
+    """Commit new file content, keeping the snapshot in step for later recovery steps.
+
+    Writes are serialized and rate limited; see RECOVERY_WRITES_PER_SECOND.
+    """
+    with _write_lock:
+        _write_limiter.acquire()
+        response = _http.put(
+            f"https://api.github.com/repos/{repo}/contents/{path}",
+            headers=GITHUB_HEADERS,
+            auth=auth,
+            json={
+                "message": message,
+                "content": base64.b64encode(content.encode()).decode(),
+                "sha": sha,
+            },
+            timeout=30,
+        )
+    response.raise_for_status()
+
+    new_sha = response.json()["content"]["sha"]
+    _remember_blob(repo, new_sha, content.encode())
+    if snapshot is not None:
+        snapshot[path] = {"content": content, "sha": new_sha}
+
+
 # ============ Data Classes ============
 
 
@@ -125,9 +448,14 @@ class RecoveryResult:
 
 
 def compute_content_hash(content: str) -> str:
-    """Compute stable hash of content."""
+    """Compute stable hash of content.
+
+    This is a change-detection fingerprint, not a security boundary, so the
+    digest is flagged usedforsecurity=False (e.g. allowed under FIPS builds).
+    The whole body is handed to OpenSSL in a single update call.
+    """
     normalized = content.strip()
-    return hashlib.sha256(normalized.encode()).hexdigest()[:16]
+    return hashlib.sha256(normalized.encode(), usedforsecurity=False).hexdigest()[:16]
 
 
 def generate_slug(title: str) -> str:
@@ -226,7 +554,10 @@ def normalize_category(category: str) -> str:
 
 
 def validate_library(
-    repo: str = "bobbyhiddn/Legate.Library", token: str | None = None, tenant_id: str = "default"
+    repo: str = "bobbyhiddn/Legate.Library",
+    token: "str | TokenPool | None" = None,
+    tenant_id: str = "default",
+    snapshot: dict | None = None,
 ) -> ValidationReport:
     """Validate library integrity without reading content details.
 
@@ -237,38 +568,18 @@ def validate_library(
     - Missing content_hash
     - Orphan entries (no source transcript)
     """
-    token = token or os.environ.get("SYSTEM_PAT")
     report = ValidationReport(tenant_id=tenant_id, timestamp=datetime.utcnow().isoformat() + "Z")
 
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/vnd.github+json",
-    }
-
     try:
-        # Get repository tree
-        branch = get_default_branch(repo, headers)
-        tree_url = f"https://api.github.com/repos/{repo}/git/trees/{branch}?recursive=1"
-        response = requests.get(tree_url, headers=headers, timeout=30)
-        response.raise_for_status()
-        tree_data = response.json()
-
-        # Filter for markdown files
-        md_files = [
-            item
-            for item in tree_data.get("tree", [])
-            if item["type"] == "blob"
-            and item["path"].endswith(".md")
-            and not item["path"].startswith(".")
-            and item["path"] != "README.md"
-        ]
+        auth = _token_pool(token)
+        if snapshot is None:
+            snapshot = _tree_snapshot(repo, auth)
+        md_files = sorted(snapshot)
 
         report.stats["total_files"] = len(md_files)
         report.stats["categories_found"] = set()
 
-        for item in md_files:
-            path = item["path"]
-
+        for path in md_files:
             # Extract category from path
             parts = Path(path).parts
             if parts:
@@ -287,14 +598,7 @@ def validate_library(
 
             # Fetch file content to check frontmatter
             try:
-                content_url = f"https://api.github.com/repos/{repo}/contents/{path}"
-                content_response = requests.get(content_url, headers=headers, timeout=30)
-                content_response.raise_for_status()
-
-                import base64
-
-                file_data = content_response.json()
-                content = base64.b64decode(file_data["content"]).decode("utf-8")
+                content, _ = _read_file(repo, path, auth, snapshot)
 
                 # Check for double frontmatter
                 frontmatters, body = parse_all_frontmatter(content)
@@ -364,53 +668,31 @@ def validate_library(
 
 
 def fix_double_frontmatter(
-    repo: str = "bobbyhiddn/Legate.Library", token: str | None = None, dry_run: bool = True
+    repo: str = "bobbyhiddn/Legate.Library",
+    token: "str | TokenPool | None" = None,
+    dry_run: bool = True,
+    snapshot: dict | None = None,
 ) -> RecoveryResult:
     """Fix files with double frontmatter blocks.
 
     Strategy: Keep first frontmatter block, merge unique fields from others,
     rewrite file with single clean frontmatter.
     """
-    token = token or os.environ.get("SYSTEM_PAT")
     result = RecoveryResult(operation="fix_double_frontmatter", success=True)
 
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/vnd.github+json",
-    }
-
     try:
+        auth = _token_pool(token)
         # Get all markdown files
-        branch = get_default_branch(repo, headers)
-        tree_url = f"https://api.github.com/repos/{repo}/git/trees/{branch}?recursive=1"
-        response = requests.get(tree_url, headers=headers, timeout=30)
-        response.raise_for_status()
-
-        md_files = [
-            item
-            for item in response.json().get("tree", [])
-            if item["type"] == "blob"
-            and item["path"].endswith(".md")
-            and not item["path"].startswith(".")
-            and item["path"] != "README.md"
-        ]
+        if snapshot is None:
+            snapshot = _tree_snapshot(repo, auth)
+        md_files = sorted(snapshot)
 
         result.files_processed = len(md_files)
 
-        for item in md_files:
-            path = item["path"]
-
+        def _process_file(path: str) -> tuple[bool, str | None]:
             try:
                 # Fetch content
-                content_url = f"https://api.github.com/repos/{repo}/contents/{path}"
-                content_response = requests.get(content_url, headers=headers, timeout=30)
-                content_response.raise_for_status()
-
-                import base64
-
-                file_data = content_response.json()
-                content = base64.b64decode(file_data["content"]).decode("utf-8")
-                sha = file_data["sha"]
+                content, sha = _read_file(repo, path, auth, snapshot)
 
                 # Check for double frontmatter
                 frontmatters, body = parse_all_frontmatter(content)
@@ -460,23 +742,28 @@ def fix_double_frontmatter(
 
                     if not dry_run:
                         # Commit fix
-                        update_response = requests.put(
-                            content_url,
-                            headers=headers,
-                            json={
-                                "message": f"[recovery] Fix double frontmatter: {path}",
-                                "content": base64.b64encode(new_content.encode()).decode(),
-                                "sha": sha,
-                            },
-                            timeout=30,
+                        _write_file(
+                            repo,
+                            path,
+                            new_content,
+                            sha,
+                            f"[recovery] Fix double frontmatter: {path}",
+                            auth,
+                            snapshot,
                         )
-                        update_response.raise_for_status()
 
-                    result.files_modified += 1
                     logger.info(f"{'[DRY RUN] Would fix' if dry_run else 'Fixed'}: {path}")
+                    return True, None
 
             except Exception as e:
-                result.errors.append(f"{path}: {str(e)}")
+                return False, f"{path}: {str(e)}"
+            return False, None
+
+        for modified, error in _map_files(_process_file, md_files):
+            if modified:
+                result.files_modified += 1
+            if error:
+                result.errors.append(error)
 
     except Exception as e:
         result.success = False
@@ -487,53 +774,29 @@ def fix_double_frontmatter(
 
 def normalize_ids(
     repo: str = "bobbyhiddn/Legate.Library",
-    token: str | None = None,
+    token: "str | TokenPool | None" = None,
     dry_run: bool = True,
     tenant_id: str = None,
+    snapshot: dict | None = None,
 ) -> RecoveryResult:
     """Normalize all entry IDs to canonical format.
 
     Format: [tenant.]library.{category}.{slug}
     """
-    token = token or os.environ.get("SYSTEM_PAT")
     result = RecoveryResult(operation="normalize_ids", success=True)
     result.details["id_changes"] = []
 
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/vnd.github+json",
-    }
-
     try:
-        branch = get_default_branch(repo, headers)
-        tree_url = f"https://api.github.com/repos/{repo}/git/trees/{branch}?recursive=1"
-        response = requests.get(tree_url, headers=headers, timeout=30)
-        response.raise_for_status()
-
-        md_files = [
-            item
-            for item in response.json().get("tree", [])
-            if item["type"] == "blob"
-            and item["path"].endswith(".md")
-            and not item["path"].startswith(".")
-            and item["path"] != "README.md"
-        ]
+        auth = _token_pool(token)
+        if snapshot is None:
+            snapshot = _tree_snapshot(repo, auth)
+        md_files = sorted(snapshot)
 
         result.files_processed = len(md_files)
 
-        for item in md_files:
-            path = item["path"]
-
+        def _process_file(path: str) -> tuple[dict | None, str | None]:
             try:
-                content_url = f"https://api.github.com/repos/{repo}/contents/{path}"
-                content_response = requests.get(content_url, headers=headers, timeout=30)
-                content_response.raise_for_status()
-
-                import base64
-
-                file_data = content_response.json()
-                content = base64.b64decode(file_data["content"]).decode("utf-8")
-                sha = file_data["sha"]
+                content, sha = _read_file(repo, path, auth, snapshot)
 
                 frontmatters, body = parse_all_frontmatter(content)
 
@@ -562,8 +825,6 @@ def normalize_ids(
                             needs_update = True
 
                     if needs_update and old_id != new_id:
-                        result.details["id_changes"].append({"path": path, "old_id": old_id, "new_id": new_id})
-
                         fm["id"] = new_id
 
                         # Ensure content_hash
@@ -594,23 +855,29 @@ def normalize_ids(
                         new_content = "\n".join(fm_lines) + body
 
                         if not dry_run:
-                            update_response = requests.put(
-                                content_url,
-                                headers=headers,
-                                json={
-                                    "message": f"[recovery] Normalize ID: {old_id} -> {new_id}",
-                                    "content": base64.b64encode(new_content.encode()).decode(),
-                                    "sha": sha,
-                                },
-                                timeout=30,
+                            _write_file(
+                                repo,
+                                path,
+                                new_content,
+                                sha,
+                                f"[recovery] Normalize ID: {old_id} -> {new_id}",
+                                auth,
+                                snapshot,
                             )
-                            update_response.raise_for_status()
 
-                        result.files_modified += 1
                         logger.info(f"{'[DRY RUN] Would normalize' if dry_run else 'Normalized'}: {old_id} -> {new_id}")
+                        return {"path": path, "old_id": old_id, "new_id": new_id}, None
 
             except Exception as e:
-                result.errors.append(f"{path}: {str(e)}")
+                return None, f"{path}: {str(e)}"
+            return None, None
+
+        for id_change, error in _map_files(_process_file, md_files):
+            if id_change:
+                result.details["id_changes"].append(id_change)
+                result.files_modified += 1
+            if error:
+                result.errors.append(error)
 
     except Exception as e:
         result.success = False
@@ -619,93 +886,123 @@ def normalize_ids(
     return result
 
 
+def _rehash_content(content: str) -> str | None:
+    """Return content with a recomputed content_hash, or None if it's already current."""
+    frontmatters, body = parse_all_frontmatter(content)
+    if not frontmatters:
+        return None
+
+    fm = merge_frontmatter(frontmatters) if len(frontmatters) > 1 else frontmatters[0]
+
+    # Compute hash
+    new_hash = compute_content_hash(body)
+    if fm.get("content_hash", "") == new_hash:
+        return None
+    fm["content_hash"] = new_hash
+
+    # Rebuild frontmatter
+    fm_lines = ["---"]
+    for key, value in fm.items():
+        if isinstance(value, str) and (key == "title" or " " in value):
+            fm_lines.append(f'{key}: "{value}"')
+        elif isinstance(value, list):
+            fm_lines.append(f"{key}: {json.dumps(value)}")
+        else:
+            fm_lines.append(f"{key}: {value}")
+    fm_lines.append("---")
+    fm_lines.append("")
+
+    return "\n".join(fm_lines) + body
+
+
 def rebuild_content_hashes(
-    repo: str = "bobbyhiddn/Legate.Library", token: str | None = None, dry_run: bool = True
+    repo: str = "bobbyhiddn/Legate.Library",
+    token: "str | TokenPool | None" = None,
+    dry_run: bool = True,
+    snapshot: dict | None = None,
 ) -> RecoveryResult:
-    """Recompute content_hash for all entries."""
-    token = token or os.environ.get("SYSTEM_PAT")
-    result = RecoveryResult(operation="rebuild_content_hashes", success=True)
+    """Recompute content_hash for all entries.
 
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/vnd.github+json",
-    }
+    Runs as a three-stage pipeline so downloads never wait on commits:
+    a thread pool fetches files into a bounded queue, this thread rehashes
+    them, and a single writer thread commits changed files at the
+    rate-limited write pace.
+    """
+    result = RecoveryResult(operation="rebuild_content_hashes", success=True)
 
     try:
-        branch = get_default_branch(repo, headers)
-        tree_url = f"https://api.github.com/repos/{repo}/git/trees/{branch}?recursive=1"
-        response = requests.get(tree_url, headers=headers, timeout=30)
-        response.raise_for_status()
-
-        md_files = [
-            item
-            for item in response.json().get("tree", [])
-            if item["type"] == "blob"
-            and item["path"].endswith(".md")
-            and not item["path"].startswith(".")
-            and item["path"] != "README.md"
-        ]
+        auth = _token_pool(token)
+        if snapshot is None:
+            snapshot = _tree_snapshot(repo, auth)
+        md_files = sorted(snapshot)
 
         result.files_processed = len(md_files)
 
-        for item in md_files:
-            path = item["path"]
-
-            try:
-                content_url = f"https://api.github.com/repos/{repo}/contents/{path}"
-                content_response = requests.get(content_url, headers=headers, timeout=30)
-                content_response.raise_for_status()
-
-                import base64
-
-                file_data = content_response.json()
-                content = base64.b64decode(file_data["content"]).decode("utf-8")
-                sha = file_data["sha"]
-
-                frontmatters, body = parse_all_frontmatter(content)
-
-                if frontmatters:
-                    fm = merge_frontmatter(frontmatters) if len(frontmatters) > 1 else frontmatters[0]
-
-                    # Compute hash
-                    new_hash = compute_content_hash(body)
-                    old_hash = fm.get("content_hash", "")
-
-                    if old_hash != new_hash:
-                        fm["content_hash"] = new_hash
-
-                        # Rebuild frontmatter
-                        fm_lines = ["---"]
-                        for key, value in fm.items():
-                            if isinstance(value, str) and (key == "title" or " " in value):
-                                fm_lines.append(f'{key}: "{value}"')
-                            elif isinstance(value, list):
-                                fm_lines.append(f"{key}: {json.dumps(value)}")
-                            else:
-                                fm_lines.append(f"{key}: {value}")
-                        fm_lines.append("---")
-                        fm_lines.append("")
-
-                        new_content = "\n".join(fm_lines) + body
-
-                        if not dry_run:
-                            update_response = requests.put(
-                                content_url,
-                                headers=headers,
-                                json={
-                                    "message": f"[recovery] Add/update content_hash: {path}",
-                                    "content": base64.b64encode(new_content.encode()).decode(),
-                                    "sha": sha,
-                                },
-                                timeout=30,
-                            )
-                            update_response.raise_for_status()
-
-                        result.files_modified += 1
-                        logger.info(f"{'[DRY RUN] Would update' if dry_run else 'Updated'} hash: {path}")
+        fetched: queue.Queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        to_write: queue.Queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        write_results: list[tuple[bool, str | None]] = []
+
+        def _fetch_files():
+            with ThreadPoolExecutor(max_workers=RECOVERY_MAX_WORKERS) as executor:
+                futures = {executor.submit(_read_file, repo, path, auth, snapshot): path for path in md_files}
+                for future in as_completed(futures):
+                    path = futures[future]
+                    try:
+                        fetched.put((path, *future.result(), None))
+                    except Exception as e:
+                        fetched.put((path, None, None, e))
+            fetched.put(_PIPELINE_DONE)
+
+        def _write_files():
+            while (item := to_write.get()) is not _PIPELINE_DONE:
+                path, new_content, sha = item
+                try:
+                    _write_file(
+                        repo,
+                        path,
+                        new_content,
+                        sha,
+                        f"[recovery] Add/update content_hash: {path}",
+                        auth,
+                        snapshot,
+                    )
+                    logger.info(f"Updated hash: {path}")
+                    write_results.append((True, None))
+                except Exception as e:
+                    write_results.append((False, f"{path}: {str(e)}"))
+
+        fetcher = threading.Thread(target=_fetch_files, daemon=True)
+        writer = threading.Thread(target=_write_files, daemon=True)
+        fetcher.start()
+        writer.start()
+
+        try:
+            while (item := fetched.get()) is not _PIPELINE_DONE:
+                path, content, sha, error = item
+                if error is not None:
+                    result.errors.append(f"{path}: {str(error)}")
+                    continue
+                try:
+                    new_content = _rehash_content(content)
+                except Exception as e:
+                    result.errors.append(f"{path}: {str(e)}")
+                    continue
+                if new_content is None:
+                    continue
+                if dry_run:
+                    logger.info(f"[DRY RUN] Would update hash: {path}")
+                    result.files_modified += 1
+                else:
+                    to_write.put((path, new_content, sha))
+        finally:
+            to_write.put(_PIPELINE_DONE)
+            writer.join()
 
-            except Exception as e:
-                result.errors.append(f"{path}: {str(e)}")
+        for modified, error in write_results:
+            if modified:
+                result.files_modified += 1
+            if error:
+                result.errors.append(error)
 
     except Exception as e:
         result.success = False
@@ -715,32 +1012,27 @@ def rebuild_content_hashes(
 
 
 def sync_category_descriptions(
-    repo: str = "bobbyhiddn/Legate.Library", token: str | None = None, dry_run: bool = True
+    repo: str = "bobbyhiddn/Legate.Library", token: "str | TokenPool | None" = None, dry_run: bool = True
 ) -> RecoveryResult:
     """Sync category descriptions from Pit database to Library.
 
     Creates description.md files in each category folder that doesn't have one.
     This ensures categories can be reconstructed from Library alone.
     """
-    token = token or os.environ.get("SYSTEM_PAT")
     result = RecoveryResult(operation="sync_category_descriptions", success=True)
     result.details["categories_synced"] = []
 
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/vnd.github+json",
-    }
-
     try:
+        auth = _token_pool(token)
         from .rag.database import get_user_categories, get_user_legato_db
 
         db = get_user_legato_db()
         categories = get_user_categories(db, "default")
 
         # Get existing files in repo
-        branch = get_default_branch(repo, headers)
+        branch = get_default_branch(repo, auth)
         tree_url = f"https://api.github.com/repos/{repo}/git/trees/{branch}?recursive=1"
-        response = requests.get(tree_url, headers=headers, timeout=30)
+        response = _http.get(tree_url, headers=GITHUB_HEADERS, auth=auth, timeout=30)
         response.raise_for_status()
 
         existing_files = {item["path"] for item in response.json().get("tree", [])}
@@ -776,11 +1068,10 @@ sort_order: {cat["sort_order"]}
             result.details["categories_synced"].append(cat["name"])
 
             if not dry_run:
-                import base64
-
-                create_response = requests.put(
+                create_response = _http.put(
                     f"https://api.github.com/repos/{repo}/contents/{desc_path}",
-                    headers=headers,
+                    headers=GITHUB_HEADERS,
+                    auth=auth,
                     json={
                         "message": f"[recovery] Add category description: {cat['name']}",
                         "content": base64.b64encode(content.encode()).decode(),
@@ -801,7 +1092,7 @@ sort_order: {cat["sort_order"]}
 
 def rebuild_database_from_library(
     repo: str = "bobbyhiddn/Legate.Library",
-    token: str | None = None,
+    token: "str | TokenPool | None" = None,
 ) -> RecoveryResult:
     """Rebuild the Pit database by re-syncing from Library.
 
@@ -824,8 +1115,9 @@ def rebuild_database_from_library(
         logger.info("Cleared knowledge_entries and embeddings tables")
 
         # Re-sync from GitHub
+        # LibrarySync takes a single token, so the whole resync uses one from the pool
         sync = LibrarySync(db)
-        stats = sync.sync_from_github(repo=repo, token=token)
+        stats = sync.sync_from_github(repo=repo, token=_token_pool(token).next())
 
         result.files_processed = stats.get("files_found", 0)
         result.files_modified = stats.get("entries_created", 0)
@@ -842,7 +1134,7 @@ def rebuild_database_from_library(
 
 def full_recovery(
     repo: str = "bobbyhiddn/Legate.Library",
-    token: str | None = None,
+    token: "str | TokenPool | None" = None,
     dry_run: bool = True,
     tenant_id: str = None,
 ) -> dict[str, RecoveryResult]:
@@ -860,25 +1152,36 @@ def full_recovery(
 
     logger.info(f"Starting full recovery {'(DRY RUN)' if dry_run else ''}")
 
+    # Fetch every note once up front and share it across steps; each step
+    # falls back to listing the tree and fetching blobs by SHA (cached across
+    # steps) if the snapshot is unavailable.
+    snapshot = None
+    try:
+        # Resolve once so every step shares the pool's rate-limit bookkeeping
+        token = _token_pool(token)
+        snapshot = _graphql_snapshot(repo, token)
+    except Exception as e:
+        logger.warning(f"GraphQL snapshot failed, falling back to per-file fetches: {e}")
+
     # 1. Validate
     logger.info("Step 1: Validating library...")
-    report = validate_library(repo, token, tenant_id or "default")
+    report = validate_library(repo, token, tenant_id or "default", snapshot)
     results["validation"] = RecoveryResult(operation="validate", success=True, details=report.to_dict())
     logger.info(f"Found {len(report.issues)} issues")
 
     # 2. Fix double frontmatter
     logger.info("Step 2: Fixing double frontmatter...")
-    results["fix_frontmatter"] = fix_double_frontmatter(repo, token, dry_run)
+    results["fix_frontmatter"] = fix_double_frontmatter(repo, token, dry_run, snapshot)
     logger.info(f"Modified {results['fix_frontmatter'].files_modified} files")
 
     # 3. Normalize IDs
     logger.info("Step 3: Normalizing IDs...")
-    results["normalize_ids"] = normalize_ids(repo, token, dry_run, tenant_id)
+    results["normalize_ids"] = normalize_ids(repo, token, dry_run, tenant_id, snapshot)
     logger.info(f"Modified {results['normalize_ids'].files_modified} files")
 
     # 4. Rebuild content hashes
     logger.info("Step 4: Rebuilding content hashes...")
-    results["rebuild_hashes"] = rebuild_content_hashes(repo, token, dry_run)
+    results["rebuild_hashes"] = rebuild_content_hashes(repo, token, dry_run, snapshot)
     logger.info(f"Modified {results['rebuild_hashes'].files_modified} files")
 
     # 5. Sync category descriptions to Library
@@ -900,6 +1203,13 @@ def full_recovery(
 # ============ CLI ============
 
 
+def _print_json(data: dict):
+    """Print data as indented JSON."""
+    sys.stdout.flush()
+    sys.stdout.buffer.write(orjson.dumps(data, option=orjson.OPT_INDENT_2) + b"\n")
+    sys.stdout.buffer.flush()
+
+
 def main():
     parser = argparse.ArgumentParser(description="Legate Studio Library Recovery Tool")
     parser.add_argument(
@@ -915,7 +1225,7 @@ def main():
         ],
     )
     parser.add_argument("--repo", default="bobbyhiddn/Legate.Library")
-    parser.add_argument("--token", help="GitHub PAT (or set SYSTEM_PAT env var)")
+    parser.add_argument("--token", help="GitHub PAT (or set SYSTEM_PATS / SYSTEM_PAT env var)")
     parser.add_argument("--tenant", help="Tenant ID for multi-tenant")
     parser.add_argument("--dry-run", action="store_true", help="Preview changes without applying")
     parser.add_argument("--verbose", "-v", action="store_true")
@@ -927,74 +1237,64 @@ def main():
         format="%(asctime)s [%(levelname)s] %(message)s",
     )
 
-    token = args.token or os.environ.get("SYSTEM_PAT")
-    if not token:
-        logger.error("No GitHub token provided. Set SYSTEM_PAT or use --token")
+    try:
+        token = TokenPool([args.token]) if args.token else TokenPool.from_env()
+    except ValueError as e:
+        logger.error(str(e))
         return 1
+    logger.info(f"Using {len(token.tokens)} GitHub token(s)")
 
     if args.operation == "validate":
         report = validate_library(args.repo, token, args.tenant or "default")
-        print(json.dumps(report.to_dict(), indent=2))
+        _print_json(report.to_dict())
 
     elif args.operation == "fix_frontmatter":
         result = fix_double_frontmatter(args.repo, token, args.dry_run)
-        print(
-            json.dumps(
-                {
-                    "operation": result.operation,
-                    "success": result.success,
-                    "files_processed": result.files_processed,
-                    "files_modified": result.files_modified,
-                    "errors": result.errors,
-                },
-                indent=2,
-            )
+        _print_json(
+            {
+                "operation": result.operation,
+                "success": result.success,
+                "files_processed": result.files_processed,
+                "files_modified": result.files_modified,
+                "errors": result.errors,
+            }
         )
 
     elif args.operation == "normalize_ids":
         result = normalize_ids(args.repo, token, args.dry_run, args.tenant)
-        print(
-            json.dumps(
-                {
-                    "operation": result.operation,
-                    "success": result.success,
-                    "files_processed": result.files_processed,
-                    "files_modified": result.files_modified,
-                    "id_changes": result.details.get("id_changes", []),
-                    "errors": result.errors,
-                },
-                indent=2,
-            )
+        _print_json(
+            {
+                "operation": result.operation,
+                "success": result.success,
+                "files_processed": result.files_processed,
+                "files_modified": result.files_modified,
+                "id_changes": result.details.get("id_changes", []),
+                "errors": result.errors,
+            }
         )
 
     elif args.operation == "rebuild_hashes":
         result = rebuild_content_hashes(args.repo, token, args.dry_run)
-        print(
-            json.dumps(
-                {
-                    "operation": result.operation,
-                    "success": result.success,
-                    "files_processed": result.files_processed,
-                    "files_modified": result.files_modified,
-                    "errors": result.errors,
-                },
-                indent=2,
-            )
+        _print_json(
+            {
+                "operation": result.operation,
+                "success": result.success,
+                "files_processed": result.files_processed,
+                "files_modified": result.files_modified,
+                "errors": result.errors,
+            }
         )
 
     elif args.operation == "sync_categories":
         result = sync_category_descriptions(args.repo, token, args.dry_run)
-        print(
-            json.dumps(
-                {
-                    "operation": result.operation,
-                    "success": result.success,
-                    "files_modified": result.files_modified,
-                    "categories_synced": result.details.get("categories_synced", []),
-                    "errors": result.errors,
-                },
-                indent=2,
-            )
+        _print_json(
+            {
+                "operation": result.operation,
+                "success": result.success,
+                "files_modified": result.files_modified,
+                "categories_synced": result.details.get("categories_synced", []),
+                "errors": result.errors,
+            }
         )
 
     elif args.operation == "rebuild_database":
@@ -1002,18 +1302,15 @@ def main():
             logger.warning("rebuild_database cannot be run in dry-run mode")
             return 1
         result = rebuild_database_from_library(args.repo, token)
-        print(
-            json.dumps(
-                {
-                    "operation": result.operation,
-                    "success": result.success,
-                    "files_processed": result.files_processed,
-                    "files_modified": result.files_modified,
-                    "details": result.details,
-                    "errors": result.errors,
-                },
-                indent=2,
-            )
+        _print_json(
+            {
+                "operation": result.operation,
+                "success": result.success,
+                "files_processed": result.files_processed,
+                "files_modified": result.files_modified,
+                "details": result.details,
+                "errors": result.errors,
+            }
         )
 
     elif args.operation == "full_recovery":
@@ -1022,7 +1319,7 @@ def main():
             op: {"success": r.success, "files_modified": r.files_modified, "errors": len(r.errors)}
             for op, r in results.items()
         }
-        print(json.dumps(summary, indent=2))
+        _print_json(summary)
 
     return 0
 
@@ -8,11 +8,15 @@ Handles subscriptions, checkout, and webhooks for:
 
 import logging
 import os
+import queue
+import threading
+import time
 from functools import wraps
 
 import stripe
 from flask import (
     Blueprint,
+    current_app,
     flash,
     jsonify,
     redirect,
@@ -46,6 +50,32 @@ STRIPE_PRODUCTS = {
     },
 }
 
+STRIPE_TIERS = frozenset(STRIPE_PRODUCTS)
+
+# {tier: price_id}, filled on first successful product sync; see get_or_create_stripe_products
+_PRICE_IDS_CACHE: dict[str, str] | None = None
+_price_ids_lock = threading.Lock()
+
+# {user_id: (stripe_customer_id, expires_at)}; see get_or_create_customer
+CUSTOMER_CACHE_TTL = 300
+CUSTOMER_CACHE_SIZE = 10_000
+
+_customer_cache: dict[str, tuple[str, float]] = {}
+_customer_cache_lock = threading.Lock()
+
+
+# Webhook side-effects run on a background thread so the endpoint can ack
+# Stripe as soon as the signature is verified (Stripe retries after ~10s).
+WEBHOOK_QUEUE_SIZE = 1024
+# Stripe already has its 200 by the time a handler runs, so transient failures
+# (e.g. a locked database) are retried here before the event is given up on.
+WEBHOOK_MAX_ATTEMPTS = 3
+WEBHOOK_RETRY_DELAY = 2  # seconds, doubled after each failed attempt
+
+_webhook_q: queue.Queue = queue.Queue(maxsize=WEBHOOK_QUEUE_SIZE)
+_webhook_worker: threading.Thread | None = None
+_webhook_worker_lock = threading.Lock()
+
 
 def _get_db():
     """Get shared database for billing tables."""
@@ -79,7 +109,27 @@ def stripe_required(f):
     return decorated
 
 
-def get_or_create_stripe_products() -> dict:
+def get_or_create_stripe_products(refresh: bool = False) -> dict:
+    """Get price IDs for every tier, syncing with Stripe on first use.
+
+    The result is cached for the life of the process, so checkout and tier
+    switches skip the Stripe and system_config round-trips. Pass refresh=True
+    to re-verify against Stripe and replace the cache.
+
+    Returns dict mapping tier name to price_id.
+    """
+    global _PRICE_IDS_CACHE
+
+    if _PRICE_IDS_CACHE is not None and not refresh:
+        return _PRICE_IDS_CACHE
+
+    with _price_ids_lock:
+        if _PRICE_IDS_CACHE is None or refresh:
+            _PRICE_IDS_CACHE = _sync_stripe_products()
+        return _PRICE_IDS_CACHE
+
+
+def _sync_stripe_products() -> dict:
     """Get or create Stripe products and prices.
 
     Returns dict mapping tier name to price_id.
@@ -176,11 +226,46 @@ def get_or_create_stripe_products() -> dict:
     return price_ids
 
 
+def _cached_customer_id(user_id: str) -> str | None:
+    """Return the cached Stripe customer ID for a user, if still fresh."""
+    with _customer_cache_lock:
+        entry = _customer_cache.get(user_id)
+        if entry is None:
+            return None
+        if entry[1] < time.monotonic():
+            del _customer_cache[user_id]
+            return None
+        return entry[0]
+
+
+def _cache_customer_id(user_id: str, customer_id: str):
+    """Remember a user's Stripe customer ID for CUSTOMER_CACHE_TTL seconds."""
+    with _customer_cache_lock:
+        _customer_cache.pop(user_id, None)
+        _customer_cache[user_id] = (customer_id, time.monotonic() + CUSTOMER_CACHE_TTL)
+        while len(_customer_cache) > CUSTOMER_CACHE_SIZE:
+            # Dicts keep insertion order, so this drops the oldest entry
+            del _customer_cache[next(iter(_customer_cache))]
+
+
+def _invalidate_customer_id(user_id: str):
+    """Drop a user's cached Stripe customer ID after its row changes."""
+    with _customer_cache_lock:
+        _customer_cache.pop(user_id, None)
+
+
 def get_or_create_customer(user_id: str) -> str:
     """Get or create a Stripe customer for a user.
 
+    Customer IDs are cached per user for CUSTOMER_CACHE_TTL seconds, so
+    repeated billing calls skip the users lookup.
+
     Returns the Stripe customer ID.
     """
+    customer_id = _cached_customer_id(user_id)
+    if customer_id:
+        return customer_id
+
     db = _get_db()
 
     # Check if user already has a Stripe customer ID
@@ -192,6 +277,7 @@ def get_or_create_customer(user_id: str) -> str:
         raise ValueError(f"User not found: {user_id}")
 
     if user["stripe_customer_id"]:
+        _cache_customer_id(user_id, user["stripe_customer_id"])
         return user["stripe_customer_id"]
 
     # Create new Stripe customer
@@ -204,6 +290,7 @@ def get_or_create_customer(user_id: str) -> str:
     # Store customer ID
     db.execute("UPDATE users SET stripe_customer_id = ? WHERE user_id = ?", (customer.id, user_id))
     db.commit()
+    _cache_customer_id(user_id, customer.id)
 
     logger.info(f"Created Stripe customer {customer.id} for user {user['github_login']}")
     return customer.id
@@ -219,7 +306,7 @@ def create_checkout_session(user_id: str, tier: str) -> str:
     Returns:
         Checkout session URL
     """
-    if tier not in STRIPE_PRODUCTS:
+    if tier not in STRIPE_TIERS:
         raise ValueError(f"Invalid tier: {tier}")
 
     price_ids = get_or_create_stripe_products()
@@ -270,7 +357,7 @@ def switch_subscription_tier(user_id: str, new_tier: str) -> dict:
     Returns:
         Dict with status and message
     """
-    if new_tier not in STRIPE_PRODUCTS:
+    if new_tier not in STRIPE_TIERS:
         raise ValueError(f"Invalid tier: {new_tier}")
 
     db = _get_db()
@@ -402,6 +489,7 @@ def handle_checkout_completed(session_data: dict):
             (subscription_id, customer_id, user_id),
         )
         db.commit()
+        _invalidate_customer_id(user_id)
         return
 
     # Update user's tier and subscription
@@ -417,6 +505,7 @@ def handle_checkout_completed(session_data: dict):
         (tier, subscription_id, customer_id, user_id),
     )
     db.commit()
+    _invalidate_customer_id(user_id)
 
     logger.info(f"Activated {tier} subscription for user {user_id}")
 
@@ -451,16 +540,19 @@ def handle_subscription_updated(subscription: dict):
     items = subscription.get("items", {}).get("data", [])
     if items:
         price_id = items[0].get("price", {}).get("id")
-        try:
-            # Look up tier by price ID in system_config
-            config = db.execute("SELECT key FROM system_config WHERE value = ?", (price_id,)).fetchone()
-        except Exception as e:
-            logger.warning(f"system_config lookup failed (table may not be initialized): {e}")
-            config = None
-
-        if config:
-            tier = config["key"].replace("stripe_price_", "")
-        else:
+        # Price map is built at startup; only hit system_config for prices it doesn't know
+        tier = current_app.config.get("STRIPE_PRICE_MAP", {}).get(price_id)
+        if not tier:
+            try:
+                # Look up tier by price ID in system_config
+                config = db.execute("SELECT key FROM system_config WHERE value = ?", (price_id,)).fetchone()
+            except Exception as e:
+                logger.warning(f"system_config lookup failed (table may not be initialized): {e}")
+                config = None
+            if config:
+                tier = config["key"].replace("stripe_price_", "")
+
+        if not tier:
             # system_config lookup failed or price not found — PRESERVE existing tier, do not overwrite
             logger.warning(
                 f"Could not resolve tier for price_id={price_id} (subscription {subscription_id}). "
@@ -509,6 +601,8 @@ def handle_subscription_deleted(subscription: dict):
         logger.warning(f"Subscription deleted but no user found: {subscription_id}")
         return
 
+    _invalidate_customer_id(user["user_id"])
+
     # Beta users are immune to webhook tier changes — admin-managed, never downgrade via webhook
     if user["is_beta"]:
         logger.info(
@@ -599,8 +693,8 @@ def index():
         has_subscription=bool(user["stripe_subscription_id"]) if user else False,
         cancel_at_period_end=cancel_at_period_end,
         period_end_date=period_end_date,
-        stripe_enabled=bool(os.environ.get("STRIPE_SECRET_KEY")),
-        products=STRIPE_PRODUCTS,
+        stripe_enabled=current_app.config.get("STRIPE_ENABLED", False),
+        products=current_app.config.get("STRIPE_PRODUCTS", STRIPE_PRODUCTS),
     )
 
 
@@ -612,7 +706,7 @@ def checkout():
     user_id = session["user"]["user_id"]
     tier = request.form.get("tier") or request.json.get("tier")
 
-    if tier not in ("byok", "managed"):
+    if tier not in STRIPE_TIERS:
         if request.is_json:
             return jsonify({"error": "Invalid tier"}), 400
         flash("Invalid subscription tier.", "error")
@@ -663,7 +757,7 @@ def switch_tier():
     user_id = session["user"]["user_id"]
     new_tier = request.form.get("tier") or request.json.get("tier")
 
-    if new_tier not in ("byok", "managed"):
+    if new_tier not in STRIPE_TIERS:
         if request.is_json:
             return jsonify({"error": "Invalid tier"}), 400
         flash("Invalid subscription tier.", "error")
@@ -761,12 +855,24 @@ def webhook():
         logger.error("Invalid webhook signature")
         return jsonify({"error": "Invalid signature"}), 400
 
-    # Handle event types
     event_type = event["type"]
     data = event["data"]["object"]
 
     logger.info(f"Received Stripe webhook: {event_type}")
 
+    _ensure_webhook_worker()
+    try:
+        _webhook_q.put_nowait((current_app._get_current_object(), event_type, data))
+    except queue.Full:
+        # Let Stripe redeliver later rather than dropping the event
+        logger.error(f"Webhook queue full, rejecting {event_type} for retry")
+        return jsonify({"error": "Webhook queue full"}), 503
+
+    return jsonify({"received": True})
+
+
+def _dispatch_webhook_event(event_type: str, data: dict):
+    """Route a verified Stripe event to its handler."""
     if event_type == "checkout.session.completed":
         handle_checkout_completed(data)
     elif event_type == "customer.subscription.updated":
@@ -778,7 +884,48 @@ def webhook():
     else:
         logger.debug(f"Unhandled webhook event type: {event_type}")
 
-    return jsonify({"received": True})
+
+def _handle_webhook_event(app, event_type: str, data: dict) -> bool:
+    """Run a queued event's handler, retrying with backoff on failure.
+
+    Returns:
+        True if the handler succeeded, False once all attempts are exhausted.
+    """
+    delay = WEBHOOK_RETRY_DELAY
+    for attempt in range(1, WEBHOOK_MAX_ATTEMPTS + 1):
+        try:
+            with app.app_context():
+                _dispatch_webhook_event(event_type, data)
+            return True
+        except Exception:
+            logger.exception(f"Webhook handler failed for {event_type} (attempt {attempt}/{WEBHOOK_MAX_ATTEMPTS})")
+        if attempt < WEBHOOK_MAX_ATTEMPTS:
+            time.sleep(delay)
+            delay *= 2
+
+    # Stripe won't redeliver an acked event; log enough to replay it by hand
+    logger.error(f"Giving up on webhook {event_type} for object {data.get('id')}; replay it from the Stripe dashboard")
+    return False
+
+
+def _drain_webhook_queue():
+    """Process queued webhook events one at a time, forever."""
+    while True:
+        app, event_type, data = _webhook_q.get()
+        try:
+            _handle_webhook_event(app, event_type, data)
+        finally:
+            _webhook_q.task_done()
+
+
+def _ensure_webhook_worker():
+    """Start the webhook worker thread if it isn't running yet."""
+    global _webhook_worker
+
+    with _webhook_worker_lock:
+        if _webhook_worker is None or not _webhook_worker.is_alive():
+            _webhook_worker = threading.Thread(target=_drain_webhook_queue, daemon=True)
+            _webhook_worker.start()
 
 
 # ============ Initialization ============
@@ -787,16 +934,22 @@ def webhook():
 def init_stripe_products_on_startup(app):
     """Initialize Stripe products on app startup.
 
-    Call this from create_app() to ensure products exist.
+    Call this from create_app() to ensure products exist. Also freezes the
+    billing page's Stripe settings into app.config so requests don't re-read them.
     """
-    if not os.environ.get("STRIPE_SECRET_KEY"):
+    app.config["STRIPE_ENABLED"] = bool(os.environ.get("STRIPE_SECRET_KEY"))
+    app.config["STRIPE_PRODUCTS"] = STRIPE_PRODUCTS
+
+    if not app.config["STRIPE_ENABLED"]:
         logger.info("Stripe not configured - skipping product initialization")
         return
 
     try:
         _init_stripe()
         with app.app_context():
-            products = get_or_create_stripe_products()
+            products = get_or_create_stripe_products(refresh=True)
+            # Reverse map lets webhooks resolve a tier without touching the DB
+            app.config["STRIPE_PRICE_MAP"] = {price_id: tier for tier, price_id in products.items()}
             logger.info(f"Stripe products initialized: {list(products.keys())}")
     except Exception as e:
         logger.error(f"Failed to initialize Stripe products: {e}")
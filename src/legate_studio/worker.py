@@ -14,22 +14,142 @@ Can run as:
 """
 
 import logging
+import math
+import os
+import re
 import secrets
+import sqlite3
 import threading
 import time
-from datetime import datetime, timedelta
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from .motif_processor import MotifProcessor
+from .rag.database import init_db
 
 logger = logging.getLogger(__name__)
 
 # Worker configuration
 POLL_INTERVAL = 2  # seconds between polls
-LOCK_DURATION = 300  # 5 minutes lock timeout
+MAX_POLL_INTERVAL = 30  # idle polls back off up to this many seconds
+POLL_INTERVAL_FACTOR = 2.0  # backoff multiplier per empty poll
+LOCK_DURATION = 300  # 5 minutes lock timeout; locked_until is unix epoch seconds
 MAX_RETRIES = 3
+BATCH_SIZE = int(os.getenv("WORKER_BATCH_SIZE", 4))  # jobs claimed per poll
+COMPLETION_BATCH_DELAY = 0.01  # seconds to coalesce retry/failure writes
+CONCURRENCY = int(os.getenv("WORKER_CONCURRENCY", 4))  # jobs processed in parallel
+# Poll only once this fraction of a full batch's slots is free, so claims under
+# sustained load fetch real batches instead of one job per freed slot
+CLAIM_FILL_RATIO = 0.75
+STOP_DRAIN_TIMEOUT = 30  # seconds stop() waits for in-flight jobs to finish
+STALE_SWEEP_INTERVAL = LOCK_DURATION  # seconds between stale-job sweeps per worker
+
+# UPDATE ... RETURNING needs SQLite 3.35+; older libraries re-SELECT the claimed rows
+_SQLITE_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# These errors are NOT retryable - they indicate permanent failures
+_PERMANENT_ERROR_RE = re.compile(r"unique constraint", re.IGNORECASE)
+_RETRYABLE_ERROR_RE = re.compile(
+    r"rate[_ ]limit"
+    r"|timeout|timed out"
+    r"|connection"
+    r"|temporary"
+    r"|database is locked"  # Outlasted busy_timeout; contention clears on retry
+    r"|overloaded"
+    r"|529"  # Anthropic overloaded
+    r"|503",  # Service unavailable
+    re.IGNORECASE,
+)
+
+# Statements are module constants so every call hands sqlite3 the same string,
+# which keeps them hot in the connection's prepared-statement cache
+_SQL_FAIL_STALE = """
+    UPDATE processing_jobs
+    SET status = 'failed',
+        error_message = 'Job timed out - stuck in processing state',
+        updated_at = CURRENT_TIMESTAMP
+    WHERE status = 'processing'
+      AND updated_at < datetime('now', '-1 hour')
+"""
+
+# Jobs are claimable if:
+# - status is 'pending', or
+# - status is 'processing' but lock has expired (crashed worker)
+_SQL_CLAIM = """
+    UPDATE processing_jobs
+    SET worker_id = ?,
+        locked_until = ?,
+        status = 'processing',
+        started_at = CASE WHEN started_at IS NULL THEN CURRENT_TIMESTAMP ELSE started_at END,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE id IN (
+        SELECT id FROM processing_jobs
+        WHERE (status = 'pending')
+           OR (status = 'processing' AND (locked_until IS NULL OR locked_until < ?))
+        ORDER BY created_at ASC
+        LIMIT ?
+    )
+""" + (" RETURNING *" if _SQLITE_HAS_RETURNING else "")
+
+# lock_until is unique to a claim, so it identifies the rows just claimed
+_SQL_SELECT_CLAIMED = """
+    SELECT * FROM processing_jobs
+    WHERE worker_id = ? AND status = 'processing' AND locked_until = ?
+    ORDER BY created_at ASC
+"""
+
+_SQL_RELEASE = """
+    UPDATE processing_jobs
+    SET status = 'pending',
+        worker_id = NULL,
+        locked_until = NULL,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE worker_id = ? AND status = 'processing' AND job_id IN ({placeholders})
+"""
+
+_SQL_RENEW = """
+    UPDATE processing_jobs
+    SET locked_until = ?, updated_at = CURRENT_TIMESTAMP
+    WHERE job_id = ? AND worker_id = ?
+"""
+
+_SQL_RENEW_MANY = """
+    UPDATE processing_jobs
+    SET locked_until = ?, updated_at = CURRENT_TIMESTAMP
+    WHERE worker_id = ? AND job_id IN ({placeholders})
+"""
+
+_SQL_RETRY = """
+    UPDATE processing_jobs
+    SET status = 'pending',
+        retry_count = ?,
+        error_message = ?,
+        worker_id = NULL,
+        locked_until = NULL,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE job_id = ?
+"""
+
+_SQL_FAIL = """
+    UPDATE processing_jobs
+    SET status = 'failed',
+        error_message = ?,
+        updated_at = CURRENT_TIMESTAMP,
+        completed_at = CURRENT_TIMESTAMP
+    WHERE job_id = ?
+"""
 
 
 class MotifWorker:
     """Background worker that processes motif jobs."""
 
+    # Shared by every worker in the process so producers can wake them without
+    # holding a reference; see notify_new_job(). The counter avoids lost wakeups
+    # when a job is queued between an empty poll and the wait.
+    _cv = threading.Condition()
+    _job_signal = 0
+
     def __init__(self, app):
         """Initialize the worker.
 
@@ -38,8 +158,40 @@ class MotifWorker:
         """
         self.app = app
         self.worker_id = f"worker-{secrets.token_hex(4)}"
+        # One connection for the worker's lifetime; the lock keeps the run loop
+        # and lock-renewal threads from interleaving statements on it
+        self._db = init_db()  # Shared DB for job queue
+        self._db_lock = threading.Lock()
         self._running = False
         self._thread = None
+        self._stop_event = threading.Event()  # interrupts idle sleeps on stop()
+        # Set once stop() has drained in-flight jobs; ends lock renewal and the flusher
+        self._shutdown_event = threading.Event()
+        # Jobs claimed in the last batch that haven't been started yet
+        self._local_queue: deque[sqlite3.Row] = deque()
+        self._claimed_at = 0.0  # time.monotonic() of the claim that filled _local_queue
+        self._current_poll_interval = POLL_INTERVAL
+        self._next_stale_sweep = 0.0  # time.monotonic() after which a claim sweeps stale jobs
+        # Pending retry/failure writes, flushed together by the flusher thread
+        self._retry_buffer: list[tuple] = []
+        self._failed_buffer: list[tuple] = []
+        self._completion_lock = threading.Lock()
+        self._flush_wanted = threading.Event()
+        self._flusher_thread = None
+        # Jobs currently being processed; their locks are renewed by _renewal_scheduler
+        self._active_jobs: set[str] = set()
+        self._active_jobs_lock = threading.Lock()
+        self._renewal_thread = None
+        # In-flight job accounting; the run loop waits on _slot_freed instead of
+        # polling while every processing slot is busy
+        self._concurrency = CONCURRENCY
+        self._in_flight = 0
+        self._slot_freed = threading.Condition()
+        self._claim_min_slots = max(1, math.ceil(min(BATCH_SIZE, self._concurrency) * CLAIM_FILL_RATIO))
+        self._pool = None
+        # With one job per claim and one slot there is nothing to queue or hand
+        # off, so the run loop claims and processes each job itself
+        self._inline = BATCH_SIZE == 1 and self._concurrency == 1
 
     def start(self):
         """Start the worker in a background thread."""
@@ -47,63 +199,112 @@ class MotifWorker:
             logger.warning(f"Worker {self.worker_id} already running")
             return
 
-        # Clean up stale jobs before starting
-        self._cleanup_stale_jobs()
-
         self._running = True
+        self._stop_event.clear()
+        self._shutdown_event.clear()
+        if not self._inline:
+            # Processing is dominated by AI and GitHub API latency, so jobs run in parallel
+            self._pool = ThreadPoolExecutor(max_workers=self._concurrency, thread_name_prefix=self.worker_id)
         self._thread = threading.Thread(target=self._run_loop, daemon=True)
         self._thread.start()
+        self._flusher_thread = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flusher_thread.start()
+        self._renewal_thread = threading.Thread(target=self._renewal_scheduler, daemon=True)
+        self._renewal_thread.start()
         logger.info(f"Motif worker {self.worker_id} started")
 
-    def _cleanup_stale_jobs(self):
-        """Mark very old processing jobs as failed to prevent infinite retries."""
-        from .rag.database import init_db
-
-        try:
-            db = init_db()
-
-            # Mark jobs stuck in 'processing' for more than 1 hour as failed
-            # These are likely from crashed workers or database lock issues
-            one_hour_ago = (datetime.utcnow() - timedelta(hours=1)).isoformat()
-
-            cursor = db.execute(
-                """
-                UPDATE processing_jobs
-                SET status = 'failed',
-                    error_message = 'Job timed out - stuck in processing state',
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE status = 'processing'
-                  AND updated_at < ?
-            """,
-                (one_hour_ago,),
-            )
-            db.commit()
-
-            if cursor.rowcount > 0:
-                logger.info(f"Cleaned up {cursor.rowcount} stale processing jobs")
-        except Exception as e:
-            logger.warning(f"Failed to cleanup stale jobs: {e}")
-
     def stop(self):
-        """Signal the worker to stop."""
+        """Signal the worker to stop.
+
+        Claims no new jobs, then waits up to STOP_DRAIN_TIMEOUT for in-flight
+        jobs before stopping lock renewal and the flusher. Jobs still running
+        after that keep their locks renewed and write their status directly.
+        """
         self._running = False
+        self._stop_event.set()
+        with self._cv:
+            self._cv.notify_all()
+        with self._slot_freed:
+            self._slot_freed.notify_all()
         if self._thread:
             self._thread.join(timeout=10)
+            self._release_local_queue()
+
+        drained = self._wait_for_idle(STOP_DRAIN_TIMEOUT)
+        if not drained:
+            logger.warning(
+                f"Worker {self.worker_id} stopping with {self._in_flight} jobs still running; "
+                "they will record their own status"
+            )
+        self._shutdown_event.set()
+        if self._pool:
+            self._pool.shutdown(wait=False)
+        if self._renewal_thread and drained:
+            self._renewal_thread.join(timeout=5)
+        if self._flusher_thread:
+            self._flush_wanted.set()
+            self._flusher_thread.join(timeout=5)
+            try:
+                self._flush_completions()  # anything queued after the flusher exited
+            except Exception as e:
+                logger.error(f"Failed to flush job status updates on stop: {e}")
+        if self._thread:
             logger.info(f"Motif worker {self.worker_id} stopped")
 
+    @classmethod
+    def notify_new_job(cls):
+        """Wake in-process workers after a job is queued.
+
+        Call after the INSERT into processing_jobs has committed. Workers in
+        other processes (worker_main.py) still pick the job up on their next poll.
+        """
+        with cls._cv:
+            cls._job_signal += 1
+            cls._cv.notify_all()
+
     def _run_loop(self):
         """Main worker loop."""
         consecutive_errors = 0
 
         while self._running:
             try:
+                if not self._inline:
+                    # Never start a job while the processing slots are full, and
+                    # don't poll until enough of them are free to claim a batch
+                    if self._local_queue:
+                        limit = self._concurrency
+                    else:
+                        limit = self._concurrency - self._claim_min_slots + 1
+                    if not self._wait_for_slot(limit):
+                        continue
+
                 with self.app.app_context():
-                    job = self._claim_job()
+                    seen_signal = MotifWorker._job_signal
+                    if self._inline:
+                        job = next(iter(self._claim_jobs(1)), None)
+                        if job:
+                            with self._slot_freed:
+                                self._in_flight += 1  # lets stop() wait for it
+                            try:
+                                self._process_job(job)
+                            finally:
+                                self._release_slot()
+                    else:
+                        if not self._local_queue:
+                            self._local_queue.extend(self._claim_jobs(self._concurrency - self._in_flight))
+                            self._claimed_at = time.monotonic()
+                        job = self._local_queue.popleft() if self._local_queue else None
+                        if job:
+                            self._start_job(job)
+
                     if job:
                         consecutive_errors = 0
-                        self._process_job(job)
+                        self._current_poll_interval = POLL_INTERVAL
                     else:
-                        time.sleep(POLL_INTERVAL)
+                        self._wait_for_job(seen_signal, self._current_poll_interval)
+                        self._current_poll_interval = min(
+                            self._current_poll_interval * POLL_INTERVAL_FACTOR, MAX_POLL_INTERVAL
+                        )
 
             except Exception as e:
                 consecutive_errors += 1
@@ -111,76 +312,183 @@ class MotifWorker:
 
                 # Back off on repeated errors
                 backoff = min(POLL_INTERVAL * (2**consecutive_errors), 60)
-                time.sleep(backoff)
+                self._stop_event.wait(backoff)
+
+    def _wait_for_slot(self, limit: float) -> bool:
+        """Block until fewer than `limit` jobs are in flight.
 
-    def _claim_job(self) -> dict | None:
-        """Attempt to claim an available job using optimistic locking.
+        Args:
+            limit: In-flight count at which to keep waiting
+
+        Returns:
+            False if the worker was stopped while waiting
+        """
+        with self._slot_freed:
+            self._slot_freed.wait_for(lambda: self._in_flight < limit or not self._running)
+        return self._running
+
+    def _wait_for_idle(self, timeout: float) -> bool:
+        """Block until no jobs are in flight.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if every in-flight job finished
+        """
+        with self._slot_freed:
+            return self._slot_freed.wait_for(lambda: self._in_flight == 0, timeout=timeout)
+
+    def _start_job(self, job: sqlite3.Row):
+        """Hand a claimed job to the processing pool.
+
+        Args:
+            job: Job row from database
+        """
+        # Claims are capped at the free slots, so jobs normally start right after
+        # the claim stamped their lock. Only refresh it if this one sat queued long
+        # enough for the lock to be at risk, and skip it if it was reclaimed
+        if time.monotonic() - self._claimed_at > LOCK_DURATION / 2 and not self._renew_lock(job["job_id"]):
+            return
+
+        with self._slot_freed:
+            self._in_flight += 1
+        try:
+            self._pool.submit(self._run_job, job)
+        except Exception:
+            self._release_slot()
+            raise
+
+    def _run_job(self, job: sqlite3.Row):
+        """Process a job on a pool thread, then free its slot.
+
+        Args:
+            job: Job row from database
+        """
+        try:
+            with self.app.app_context():
+                self._process_job(job)
+        except Exception as e:
+            logger.error(f"Unhandled error processing job {job['job_id']}: {e}")
+        finally:
+            self._release_slot()
+
+    def _release_slot(self):
+        """Mark one in-flight job as finished and wake the run loop."""
+        with self._slot_freed:
+            self._in_flight -= 1
+            self._slot_freed.notify_all()
+
+    def _wait_for_job(self, seen_signal: int, timeout: float):
+        """Sleep until a job is queued in this process, stop() is called, or timeout.
+
+        The timeout is a safety net for jobs queued by other processes.
+
+        Args:
+            seen_signal: Value of _job_signal read before the last poll
+            timeout: Maximum seconds to wait
+        """
+        with self._cv:
+            self._cv.wait_for(lambda: MotifWorker._job_signal != seen_signal or not self._running, timeout=timeout)
+
+    @contextmanager
+    def _transaction(self, immediate: bool = False):
+        """Run writes on the shared connection as one transaction.
+
+        Commits on success and rolls back on any error. A failed statement would
+        otherwise leave sqlite3's implicit transaction open on the connection, and
+        every later BEGIN IMMEDIATE in _claim_jobs would fail with "cannot start a
+        transaction within a transaction".
+
+        Args:
+            immediate: Take the database write lock up front with BEGIN IMMEDIATE
+
+        Yields:
+            The shared connection, held under _db_lock
+        """
+        with self._db_lock:
+            db = self._db
+            try:
+                if immediate:
+                    if db.in_transaction:
+                        db.rollback()  # never nest inside a transaction left open by a failed write
+                    db.execute("BEGIN IMMEDIATE")
+                yield db
+                db.commit()
+            except BaseException:
+                db.rollback()
+                raise
+
+    def _claim_jobs(self, free_slots: int) -> list[sqlite3.Row]:
+        """Attempt to claim available jobs using optimistic locking.
 
         Uses an atomic UPDATE with subquery to prevent race conditions
         when multiple workers are running.
 
+        Args:
+            free_slots: Idle processing slots; at most min(BATCH_SIZE, free_slots)
+                jobs are claimed so none sit locked waiting for a slot
+
         Returns:
-            Job dict if claimed, None if no jobs available
+            Claimed job rows, oldest first (empty if no jobs available)
         """
-        from .rag.database import init_db
-
-        db = init_db()  # Shared DB for job queue
-        now = datetime.utcnow()
-        lock_until = now + timedelta(seconds=LOCK_DURATION)
-
-        # Find and claim a job atomically
-        # Jobs are claimable if:
-        # - status is 'pending', or
-        # - status is 'processing' but lock has expired (crashed worker)
-        cursor = db.execute(
-            """
-            UPDATE processing_jobs
-            SET worker_id = ?,
-                locked_until = ?,
-                status = 'processing',
-                started_at = COALESCE(started_at, ?),
-                updated_at = ?
-            WHERE job_id = (
-                SELECT job_id FROM processing_jobs
-                WHERE (status = 'pending')
-                   OR (status = 'processing' AND (locked_until IS NULL OR locked_until < ?))
-                ORDER BY created_at ASC
-                LIMIT 1
+        now = time.time()
+        lock_until = now + LOCK_DURATION
+        sweep_stale = time.monotonic() >= self._next_stale_sweep
+
+        # Find and claim a batch of jobs atomically. Take the write lock up front:
+        # a deferred transaction would read the candidates first and could hit
+        # SQLITE_BUSY upgrading to a write lock while another worker claims the
+        # same rows (busy_timeout doesn't help there)
+        with self._transaction(immediate=True) as db:
+            # Fail jobs stuck in 'processing' for more than 1 hour instead of
+            # reclaiming them; they are likely from crashed workers or database
+            # lock issues, and reclaiming would retry them forever. The sweep
+            # scans the table, so it runs at most once per STALE_SWEEP_INTERVAL
+            stale = db.execute(_SQL_FAIL_STALE).rowcount if sweep_stale else 0
+            cursor = db.execute(
+                _SQL_CLAIM,
+                (self.worker_id, lock_until, now, max(1, min(BATCH_SIZE, free_slots))),
             )
-        """,
-            (self.worker_id, lock_until, now, now, now),
-        )
-
-        db.commit()
-
-        if cursor.rowcount == 0:
-            return None
-
-        # Fetch the claimed job
-        row = db.execute(
-            """
-            SELECT * FROM processing_jobs
-            WHERE worker_id = ? AND status = 'processing'
-            ORDER BY updated_at DESC
-            LIMIT 1
-        """,
-            (self.worker_id,),
-        ).fetchone()
-
-        if row:
+            if _SQLITE_HAS_RETURNING:
+                # RETURNING hands back the claimed rows directly, in no particular order
+                rows = sorted(cursor.fetchall(), key=lambda row: (row["created_at"] or "", row["id"]))
+            elif cursor.rowcount:
+                # Read the claimed rows back before committing, so a claim is one commit
+                rows = db.execute(_SQL_SELECT_CLAIMED, (self.worker_id, lock_until)).fetchall()
+            else:
+                rows = []
+
+        if sweep_stale:
+            self._next_stale_sweep = time.monotonic() + STALE_SWEEP_INTERVAL
+        if stale:
+            logger.info(f"Cleaned up {stale} stale processing jobs")
+
+        for row in rows:
             logger.info(f"Worker {self.worker_id} claimed job {row['job_id']} for user {row['user_id']}")
-            return dict(row)
+        return rows
 
-        return None
+    def _release_local_queue(self):
+        """Hand claimed-but-unstarted jobs back to the queue for other workers."""
+        job_ids = [job["job_id"] for job in self._local_queue]
+        self._local_queue.clear()
+        if not job_ids:
+            return
 
-    def _process_job(self, job: dict):
+        try:
+            placeholders = ",".join("?" * len(job_ids))
+            with self._transaction() as db:
+                db.execute(_SQL_RELEASE.format(placeholders=placeholders), (self.worker_id, *job_ids))
+            logger.info(f"Worker {self.worker_id} released {len(job_ids)} unstarted jobs")
+        except Exception as e:
+            logger.warning(f"Failed to release unstarted jobs: {e}")
+
+    def _process_job(self, job: sqlite3.Row):
         """Process a single job through all stages.
 
         Args:
-            job: Job dict from database
+            job: Job row from database
         """
-        from .motif_processor import MotifProcessor
-
         job_id = job["job_id"]
         user_id = job["user_id"]
 
@@ -192,18 +500,16 @@ class MotifWorker:
         try:
             logger.info(f"Processing job {job_id} for user {user_id}")
 
-            # Set up lock renewal thread
-            stop_renewal = threading.Event()
-            renewal_thread = threading.Thread(target=self._lock_renewal_loop, args=(job_id, stop_renewal), daemon=True)
-            renewal_thread.start()
+            # Keep the lock renewed by the shared scheduler while we work
+            with self._active_jobs_lock:
+                self._active_jobs.add(job_id)
 
             try:
                 processor = MotifProcessor(job_id, user_id, self.app)
-                processor.process(job["input_content"], job.get("source_id"))
+                processor.process(job["input_content"], job["source_id"])
             finally:
-                # Stop lock renewal
-                stop_renewal.set()
-                renewal_thread.join(timeout=5)
+                with self._active_jobs_lock:
+                    self._active_jobs.discard(job_id)
 
             logger.info(f"Job {job_id} completed successfully")
 
@@ -211,47 +517,55 @@ class MotifWorker:
             logger.error(f"Job {job_id} failed: {e}")
 
             # Check if we should retry
-            retry_count = job.get("retry_count", 0)
+            retry_count = job["retry_count"] or 0
             if retry_count < MAX_RETRIES and self._is_retryable(e):
                 self._mark_job_for_retry(job_id, retry_count + 1, str(e))
             else:
                 self._mark_job_failed(job_id, str(e))
 
-    def _lock_renewal_loop(self, job_id: str, stop_event: threading.Event):
-        """Periodically renew the job lock to prevent timeout.
-
-        Args:
-            job_id: The job ID to renew lock for
-            stop_event: Event to signal when to stop
-        """
+    def _renewal_scheduler(self):
+        """Renew locks for every in-flight job at half the lock duration."""
         renewal_interval = LOCK_DURATION // 2  # Renew at half the lock duration
 
-        while not stop_event.wait(renewal_interval):
+        while True:
+            if self._shutdown_event.is_set():
+                # stop() gave up waiting on some jobs; keep their locks alive until they finish
+                if self._wait_for_idle(renewal_interval):
+                    return
+            elif self._shutdown_event.wait(renewal_interval):
+                continue
             try:
-                self._renew_lock(job_id)
+                self._renew_active_locks()
             except Exception as e:
-                logger.warning(f"Failed to renew lock for {job_id}: {e}")
+                logger.warning(f"Failed to renew job locks: {e}")
+
+    def _renew_active_locks(self):
+        """Renew the locks of all in-flight jobs in one UPDATE."""
+        with self._active_jobs_lock:
+            job_ids = list(self._active_jobs)
+        if not job_ids:
+            return
 
-    def _renew_lock(self, job_id: str):
+        lock_until = time.time() + LOCK_DURATION
+        placeholders = ",".join("?" * len(job_ids))
+
+        with self._transaction() as db:
+            db.execute(_SQL_RENEW_MANY.format(placeholders=placeholders), (lock_until, self.worker_id, *job_ids))
+
+    def _renew_lock(self, job_id: str) -> bool:
         """Renew the job lock to prevent timeout.
 
         Args:
             job_id: The job ID to renew lock for
-        """
-        from .rag.database import init_db
 
-        db = init_db()
-        lock_until = datetime.utcnow() + timedelta(seconds=LOCK_DURATION)
+        Returns:
+            True if this worker still holds the job
+        """
+        lock_until = time.time() + LOCK_DURATION
 
-        db.execute(
-            """
-            UPDATE processing_jobs
-            SET locked_until = ?, updated_at = CURRENT_TIMESTAMP
-            WHERE job_id = ? AND worker_id = ?
-        """,
-            (lock_until, job_id, self.worker_id),
-        )
-        db.commit()
+        with self._transaction() as db:
+            cursor = db.execute(_SQL_RENEW, (lock_until, job_id, self.worker_id))
+        return cursor.rowcount > 0
 
     def _is_retryable(self, error: Exception) -> bool:
         """Determine if an error is retryable.
@@ -262,79 +576,87 @@ class MotifWorker:
         Returns:
             True if the error is transient and should be retried
         """
-        error_str = str(error).lower()
-
-        # These errors are NOT retryable - they indicate permanent failures
-        permanent_errors = [
-            "unique constraint",
-            "database is locked",  # SQLite contention - backing off won't help if stuck
-        ]
-        if any(pattern in error_str for pattern in permanent_errors):
-            return False
-
-        retryable_patterns = [
-            "rate_limit",
-            "rate limit",
-            "timeout",
-            "timed out",
-            "connection",
-            "temporary",
-            "overloaded",
-            "529",  # Anthropic overloaded
-            "503",  # Service unavailable
-        ]
-        return any(pattern in error_str for pattern in retryable_patterns)
+        error_str = str(error)
+        return not _PERMANENT_ERROR_RE.search(error_str) and bool(_RETRYABLE_ERROR_RE.search(error_str))
 
     def _mark_job_for_retry(self, job_id: str, retry_count: int, error: str):
-        """Mark a job for retry.
+        """Queue a job to be marked for retry on the next flush.
 
         Args:
             job_id: The job ID
             retry_count: New retry count
             error: Error message from this attempt
         """
-        from .rag.database import init_db
-
-        db = init_db()
-        db.execute(
-            """
-            UPDATE processing_jobs
-            SET status = 'pending',
-                retry_count = ?,
-                error_message = ?,
-                worker_id = NULL,
-                locked_until = NULL,
-                updated_at = CURRENT_TIMESTAMP
-            WHERE job_id = ?
-        """,
-            (retry_count, f"Retry {retry_count}: {error}", job_id),
-        )
-        db.commit()
+        with self._completion_lock:
+            self._retry_buffer.append((retry_count, f"Retry {retry_count}: {error}", job_id))
+        self._request_flush()
 
         logger.info(f"Job {job_id} marked for retry (attempt {retry_count})")
 
     def _mark_job_failed(self, job_id: str, error: str):
-        """Mark a job as failed.
+        """Queue a job to be marked as failed on the next flush.
 
         Args:
             job_id: The job ID
             error: Error message
         """
-        from .rag.database import init_db
-
-        db = init_db()
-        db.execute(
-            """
-            UPDATE processing_jobs
-            SET status = 'failed',
-                error_message = ?,
-                updated_at = CURRENT_TIMESTAMP,
-                completed_at = CURRENT_TIMESTAMP
-            WHERE job_id = ?
-        """,
-            (error, job_id),
-        )
-        db.commit()
+        with self._completion_lock:
+            self._failed_buffer.append((error, job_id))
+        self._request_flush()
+
+    def _request_flush(self):
+        """Hand buffered status updates to the flusher, or write them now once it has stopped."""
+        if not self._shutdown_event.is_set():
+            self._flush_wanted.set()
+            return
+        try:
+            self._flush_completions()
+        except Exception as e:
+            logger.error(f"Failed to flush job status updates after stop: {e}")
+
+    def _flush_loop(self):
+        """Flush buffered retry/failure writes, coalescing bursts into one transaction."""
+        consecutive_failures = 0
+        while True:
+            self._flush_wanted.wait()
+            # Give concurrent completions a moment to join this batch
+            self._stop_event.wait(COMPLETION_BATCH_DELAY)
+            self._flush_wanted.clear()
+            try:
+                self._flush_completions()
+                consecutive_failures = 0
+            except Exception as e:
+                consecutive_failures += 1
+                logger.error(f"Failed to flush job status updates: {e}")
+                # The updates went back into the buffers; retry them after a backoff
+                # instead of waiting for some other job to finish
+                backoff = min(POLL_INTERVAL * (2 ** (consecutive_failures - 1)), 60)
+                self._shutdown_event.wait(backoff)
+                self._flush_wanted.set()
+            if self._shutdown_event.is_set():
+                return
+
+    def _flush_completions(self):
+        """Write all buffered retry/failure updates in a single transaction."""
+        with self._completion_lock:
+            retries, self._retry_buffer = self._retry_buffer, []
+            failures, self._failed_buffer = self._failed_buffer, []
+        if not retries and not failures:
+            return
+
+        try:
+            with self._transaction() as db:
+                db.executemany(_SQL_RETRY, retries)
+                db.executemany(_SQL_FAIL, failures)
+        except Exception:
+            # Put the updates back so the next flush retries them
+            with self._completion_lock:
+                self._retry_buffer[:0] = retries
+                self._failed_buffer[:0] = failures
+            raise
+
+        if retries:
+            self.notify_new_job()  # retried jobs are claimable again
 
 
 def start_worker(app) -> MotifWorker:
@@ -11,12 +11,14 @@ Configuration via environment:
 - FLY_PROCESS_GROUP: Set to 'worker' by Fly.io
 - WORKER_POLL_INTERVAL: Seconds between polls (default: 2)
 - WORKER_LOCK_DURATION: Lock timeout in seconds (default: 300)
+- WORKER_BATCH_SIZE: Jobs claimed per poll (default: 4)
+- WORKER_CONCURRENCY: Jobs processed in parallel (default: 4)
 """
 
 import logging
 import signal
 import sys
-import time
+import threading
 
 # Configure logging before imports
 logging.basicConfig(
@@ -49,16 +51,14 @@ def main():
     worker = MotifWorker(app)
 
     # Graceful shutdown handling
-    shutdown_requested = False
+    shutdown_event = threading.Event()
 
     def signal_handler(signum, frame):
-        nonlocal shutdown_requested
-        if shutdown_requested:
+        if shutdown_event.is_set():
             logger.warning("Force shutdown requested")
             sys.exit(1)
-        shutdown_requested = True
+        shutdown_event.set()
         logger.info(f"Received signal {signum}, initiating graceful shutdown...")
-        worker.stop()
 
     signal.signal(signal.SIGTERM, signal_handler)
     signal.signal(signal.SIGINT, signal_handler)
@@ -67,13 +67,8 @@ def main():
     logger.info("Starting worker...")
     worker.start()
 
-    # Keep running until shutdown
-    try:
-        while not shutdown_requested:
-            time.sleep(1)
-    except KeyboardInterrupt:
-        logger.info("Keyboard interrupt received")
-        shutdown_requested = True
+    # Sleep until a signal arrives
+    shutdown_event.wait()
 
     # Stop worker
     logger.info("Stopping worker...")
@@ -0,0 +1,68 @@
+"""
+JSON provider tests.
+
+The app serializes responses with orjson; these pin where its output matches
+Flask's default provider and where it intentionally differs.
+"""
+import math
+from datetime import datetime
+
+import pytest
+from flask import jsonify
+from flask.json.provider import DefaultJSONProvider
+
+from legate_studio.core import OrjsonProvider
+
+
+def test_app_uses_orjson_provider(app):
+    """create_app() installs the orjson provider."""
+    assert isinstance(app.json, OrjsonProvider)
+
+
+def test_keys_are_sorted(app):
+    """Keys are sorted at every level, like the default provider."""
+    assert app.json.dumps({"b": 1, "a": {"d": 2, "c": 3}}) == '{"a":{"c":3,"d":2},"b":1}'
+
+
+def test_non_str_keys_are_coerced(app):
+    """Int keys become strings, like the default provider."""
+    assert app.json.dumps({2: "b", 1: "a"}) == '{"1":"a","2":"b"}'
+
+
+def test_datetime_matches_default_provider(app):
+    """Datetimes go through Flask's default() and serialize as HTTP dates."""
+    value = {"at": datetime(2024, 1, 2, 3, 4, 5)}
+
+    assert app.json.dumps(value) == DefaultJSONProvider(app).dumps(value, separators=(",", ":"))
+    assert app.json.dumps(value) == '{"at":"Tue, 02 Jan 2024 03:04:05 GMT"}'
+
+
+def test_jsonify_response(app):
+    """jsonify() responses use the orjson provider."""
+    with app.test_request_context():
+        response = jsonify({"when": datetime(2024, 1, 2), "b": 1, 1: "x"})
+
+    assert response.mimetype == "application/json"
+    assert response.get_data(as_text=True).strip() == '{"1":"x","b":1,"when":"Tue, 02 Jan 2024 00:00:00 GMT"}'
+
+
+def test_non_ascii_is_not_escaped(app):
+    """Non-ASCII is emitted as UTF-8 instead of \\u escapes."""
+    assert app.json.dumps({"name": "café"}) == '{"name":"café"}'
+
+
+def test_nan_and_infinity_become_null(app):
+    """NaN and Infinity serialize as null rather than invalid JSON."""
+    assert app.json.dumps([math.nan, math.inf, -math.inf]) == "[null,null,null]"
+
+
+def test_ints_wider_than_64_bits_raise(app):
+    """orjson can't encode ints wider than 64 bits."""
+    with pytest.raises(TypeError):
+        app.json.dumps({"big": 2**64})
+
+
+def test_stdlib_kwargs_fall_back_to_json(app):
+    """indent is honoured, and other stdlib kwargs use the stdlib encoder."""
+    assert app.json.dumps({"a": 1}, indent=2) == '{\n  "a": 1\n}'
+    assert app.json.dumps({"name": "café"}, ensure_ascii=True) == '{"name": "caf\\u00e9"}'
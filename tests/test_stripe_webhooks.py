@@ -0,0 +1,46 @@
+"""
+Stripe webhook queue tests.
+
+Exercise the background handler's retry behaviour without talking to Stripe.
+"""
+import pytest
+from flask import Flask
+
+
+@pytest.fixture
+def billing(monkeypatch):
+    from legate_studio import stripe_billing
+
+    monkeypatch.setattr(stripe_billing, "WEBHOOK_RETRY_DELAY", 0)
+    return stripe_billing
+
+
+def test_webhook_handler_retried_after_transient_failure(billing, monkeypatch):
+    """A handler that fails once still applies the event on the next attempt."""
+    calls = []
+
+    def flaky_dispatch(event_type, data):
+        calls.append(event_type)
+        if len(calls) == 1:
+            raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(billing, "_dispatch_webhook_event", flaky_dispatch)
+
+    assert billing._handle_webhook_event(Flask(__name__), "checkout.session.completed", {"id": "cs_1"})
+    assert calls == ["checkout.session.completed"] * 2
+
+
+def test_webhook_handler_gives_up_after_max_attempts(billing, monkeypatch, caplog):
+    """Persistent failures stop after WEBHOOK_MAX_ATTEMPTS and are logged with tracebacks."""
+    calls = []
+
+    def failing_dispatch(event_type, data):
+        calls.append(event_type)
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(billing, "_dispatch_webhook_event", failing_dispatch)
+
+    assert not billing._handle_webhook_event(Flask(__name__), "checkout.session.completed", {"id": "cs_1"})
+    assert len(calls) == billing.WEBHOOK_MAX_ATTEMPTS
+    assert sum(record.exc_info is not None for record in caplog.records) == billing.WEBHOOK_MAX_ATTEMPTS
+    assert "cs_1" in caplog.records[-1].getMessage()
@@ -0,0 +1,324 @@
+"""
+Motif worker tests against a temporary database.
+
+Exercise the job-queue SQL on the worker's shared connection directly
+(claim, renew, flush) without starting the worker threads.
+"""
+import sqlite3
+import threading
+import time
+
+import pytest
+from flask import Flask
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "legato.db"
+
+
+@pytest.fixture
+def worker(db_path, monkeypatch):
+    """A MotifWorker whose shared connection points at a temp database."""
+    from legate_studio import worker as worker_module
+    from legate_studio.rag.database import init_db
+
+    monkeypatch.setattr(worker_module, "init_db", lambda: init_db(db_path=db_path))
+    motif_worker = worker_module.MotifWorker(Flask(__name__))
+    yield motif_worker
+    motif_worker._db.close()
+
+
+def add_jobs(worker, count):
+    """Queue `count` pending jobs, oldest first."""
+    for i in range(count):
+        worker._db.execute(
+            "INSERT INTO processing_jobs (job_id, user_id, input_content, status, created_at)"
+            " VALUES (?, 'user', 'text', 'pending', datetime('now', ?))",
+            (f"job-{i}", f"-{count - i} seconds"),
+        )
+    worker._db.commit()
+
+
+def job_row(worker, job_id):
+    return worker._db.execute("SELECT * FROM processing_jobs WHERE job_id = ?", (job_id,)).fetchone()
+
+
+def test_claim_jobs_locks_oldest_batch(worker):
+    """Claims are limited by free slots, oldest first, and locked to this worker."""
+    add_jobs(worker, 3)
+
+    rows = worker._claim_jobs(free_slots=2)
+
+    assert [row["job_id"] for row in rows] == ["job-0", "job-1"]
+    for row in rows:
+        assert row["status"] == "processing"
+        assert row["worker_id"] == worker.worker_id
+    assert job_row(worker, "job-2")["status"] == "pending"
+    assert not worker._db.in_transaction
+
+
+def test_renew_lock_only_for_owner(worker):
+    """Renewing succeeds for jobs this worker holds and fails for others."""
+    add_jobs(worker, 1)
+    [row] = worker._claim_jobs(free_slots=1)
+
+    assert worker._renew_lock(row["job_id"])
+    worker._db.execute("UPDATE processing_jobs SET worker_id = 'worker-other'")
+    worker._db.commit()
+    assert not worker._renew_lock(row["job_id"])
+
+
+def test_flush_completions_writes_retries_and_failures(worker):
+    """Buffered retry/failure updates land in one flush."""
+    add_jobs(worker, 2)
+    worker._claim_jobs(free_slots=2)
+
+    worker._mark_job_for_retry("job-0", 1, "timeout")
+    worker._mark_job_failed("job-1", "bad input")
+    worker._flush_completions()
+
+    retried, failed = job_row(worker, "job-0"), job_row(worker, "job-1")
+    assert (retried["status"], retried["retry_count"], retried["worker_id"]) == ("pending", 1, None)
+    assert (failed["status"], failed["error_message"]) == ("failed", "bad input")
+    assert worker._retry_buffer == [] and worker._failed_buffer == []
+
+
+def test_failed_write_does_not_poison_connection(worker, db_path):
+    """A write that fails mid-transaction is rolled back so later claims still work."""
+    add_jobs(worker, 2)
+    [row] = worker._claim_jobs(free_slots=1)
+    worker._active_jobs.add(row["job_id"])
+
+    # Another connection holds the write lock, so the renewal UPDATE fails
+    worker._db.execute("PRAGMA busy_timeout = 0")
+    blocker = sqlite3.connect(db_path, isolation_level=None)
+    blocker.execute("BEGIN IMMEDIATE")
+    try:
+        with pytest.raises(sqlite3.OperationalError, match="locked"):
+            worker._renew_active_locks()
+        assert not worker._db.in_transaction
+    finally:
+        blocker.execute("ROLLBACK")
+        blocker.close()
+
+    assert [claimed["job_id"] for claimed in worker._claim_jobs(free_slots=1)] == ["job-1"]
+
+
+def test_claim_recovers_from_open_transaction(worker):
+    """A transaction left open on the shared connection doesn't block claiming."""
+    add_jobs(worker, 1)
+    worker._db.execute("UPDATE processing_jobs SET error_message = 'uncommitted'")
+    assert worker._db.in_transaction
+
+    [row] = worker._claim_jobs(free_slots=1)
+
+    assert row["job_id"] == "job-0"
+    assert row["error_message"] is None
+    assert not worker._db.in_transaction
+
+
+def test_failed_begin_is_rolled_back(worker, db_path):
+    """A claim whose BEGIN IMMEDIATE can't get the write lock leaves no transaction behind."""
+    add_jobs(worker, 1)
+    worker._db.execute("PRAGMA busy_timeout = 0")
+    blocker = sqlite3.connect(db_path, isolation_level=None)
+    blocker.execute("BEGIN IMMEDIATE")
+    try:
+        with pytest.raises(sqlite3.OperationalError, match="locked"):
+            worker._claim_jobs(free_slots=1)
+        assert not worker._db.in_transaction
+    finally:
+        blocker.execute("ROLLBACK")
+        blocker.close()
+
+    assert [row["job_id"] for row in worker._claim_jobs(free_slots=1)] == ["job-0"]
+
+
+def add_stale_job(worker, job_id):
+    """Queue a job that has sat in 'processing' for two hours."""
+    worker._db.execute(
+        "INSERT INTO processing_jobs (job_id, user_id, input_content, status, locked_until, updated_at)"
+        " VALUES (?, 'user', 'text', 'processing', ?, datetime('now', '-2 hours'))",
+        (job_id, time.time() + 3600),
+    )
+    worker._db.commit()
+
+
+def test_stale_sweep_is_throttled(worker, monkeypatch):
+    """Stale jobs are failed by the first claim, then at most once per STALE_SWEEP_INTERVAL."""
+    from legate_studio import worker as worker_module
+
+    add_stale_job(worker, "stale-0")
+    worker._claim_jobs(free_slots=1)
+    assert job_row(worker, "stale-0")["status"] == "failed"
+
+    add_stale_job(worker, "stale-1")
+    worker._claim_jobs(free_slots=1)
+    assert job_row(worker, "stale-1")["status"] == "processing"
+
+    monkeypatch.setattr(worker_module, "STALE_SWEEP_INTERVAL", 0)
+    worker._next_stale_sweep = 0.0
+    worker._claim_jobs(free_slots=1)
+    assert job_row(worker, "stale-1")["status"] == "failed"
+
+
+class BlockingProcessor:
+    """MotifProcessor stand-in that fails with a permanent error once released."""
+
+    started = None
+    release = None
+
+    def __init__(self, job_id, user_id, app):
+        pass
+
+    def process(self, content, source_id):
+        BlockingProcessor.started.set()
+        BlockingProcessor.release.wait(5)
+        raise ValueError("bad input")
+
+
+@pytest.fixture
+def blocking_processor(monkeypatch):
+    from legate_studio import worker as worker_module
+
+    BlockingProcessor.started = threading.Event()
+    BlockingProcessor.release = threading.Event()
+    monkeypatch.setattr(worker_module, "MotifProcessor", BlockingProcessor)
+    yield BlockingProcessor
+    BlockingProcessor.release.set()
+
+
+def wait_for_status(worker, job_id, status, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if job_row(worker, job_id)["status"] == status:
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_stop_waits_for_running_jobs(worker, blocking_processor):
+    """stop() drains in-flight jobs before shutting down the flusher."""
+    add_jobs(worker, 1)
+    worker.start()
+    assert blocking_processor.started.wait(5)
+
+    threading.Timer(0.2, blocking_processor.release.set).start()
+    worker.stop()
+
+    row = job_row(worker, "job-0")
+    assert (row["status"], row["error_message"]) == ("failed", "bad input")
+    assert worker._failed_buffer == []
+
+
+def test_job_outliving_stop_still_records_status(worker, blocking_processor, monkeypatch):
+    """A job still running when stop() gives up writes its status directly."""
+    from legate_studio import worker as worker_module
+
+    monkeypatch.setattr(worker_module, "STOP_DRAIN_TIMEOUT", 0.1)
+    add_jobs(worker, 1)
+    worker.start()
+    assert blocking_processor.started.wait(5)
+
+    worker.stop()
+    assert job_row(worker, "job-0")["status"] == "processing"
+
+    blocking_processor.release.set()
+    assert wait_for_status(worker, "job-0", "failed")
+    assert worker._failed_buffer == []
+
+
+def test_failed_flush_is_retried(worker, db_path, monkeypatch):
+    """Updates from a failed flush are written on a later attempt without new completions."""
+    from legate_studio import worker as worker_module
+
+    monkeypatch.setattr(worker_module, "POLL_INTERVAL", 0.05)
+    add_jobs(worker, 1)
+    worker._claim_jobs(free_slots=1)
+    flusher = threading.Thread(target=worker._flush_loop, daemon=True)
+    flusher.start()
+
+    worker._db.execute("PRAGMA busy_timeout = 0")
+    blocker = sqlite3.connect(db_path, isolation_level=None)
+    blocker.execute("BEGIN IMMEDIATE")
+    try:
+        worker._mark_job_failed("job-0", "bad input")
+        time.sleep(0.2)  # at least one flush attempt fails on the lock
+        assert job_row(worker, "job-0")["status"] == "processing"
+    finally:
+        blocker.execute("ROLLBACK")
+        blocker.close()
+
+    assert wait_for_status(worker, "job-0", "failed")
+    worker._shutdown_event.set()
+    worker._flush_wanted.set()
+    flusher.join(timeout=5)
+
+
+class QuickProcessor:
+    """MotifProcessor stand-in that succeeds after a short delay."""
+
+    processed = None
+    done = None
+    expected = 0
+    lock = threading.Lock()
+
+    def __init__(self, job_id, user_id, app):
+        self.job_id = job_id
+
+    def process(self, content, source_id):
+        time.sleep(0.01)
+        with QuickProcessor.lock:
+            QuickProcessor.processed.append(self.job_id)
+            if len(QuickProcessor.processed) == QuickProcessor.expected:
+                QuickProcessor.done.set()
+
+
+@pytest.fixture
+def quick_processor(monkeypatch):
+    from legate_studio import worker as worker_module
+
+    QuickProcessor.processed = []
+    QuickProcessor.done = threading.Event()
+    monkeypatch.setattr(worker_module, "MotifProcessor", QuickProcessor)
+    return QuickProcessor
+
+
+def test_starting_claimed_jobs_does_not_renew_locks(worker, quick_processor):
+    """Jobs started straight from a claim rely on the lock the claim stamped."""
+    add_jobs(worker, 12)
+    quick_processor.expected = 12
+    statements = []
+    worker._db.set_trace_callback(statements.append)
+
+    worker.start()
+    assert quick_processor.done.wait(10)
+    worker.stop()
+
+    assert not [sql for sql in statements if "SET locked_until =" in sql]
+    assert sorted(quick_processor.processed) == sorted(f"job-{i}" for i in range(12))
+
+
+def test_claims_fill_batches_under_sustained_load(worker, quick_processor):
+    """With a backlog, the run loop waits for enough free slots to claim a real batch."""
+    add_jobs(worker, 40)
+    quick_processor.expected = 40
+    claim_sizes = []
+    claim_jobs = worker._claim_jobs
+
+    def recording_claim(free_slots):
+        rows = claim_jobs(free_slots)
+        claim_sizes.append(len(rows))
+        return rows
+
+    worker._claim_jobs = recording_claim
+    worker.start()
+    assert quick_processor.done.wait(10)
+    worker.stop()
+
+    # Only the claim that drains the backlog may come up short
+    batches = [size for size in claim_sizes if size]
+    assert sum(batches) == 40
+    assert all(size >= worker._claim_min_slots for size in batches[:-1])
+    assert worker._claim_min_slots > 1
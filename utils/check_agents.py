@@ -10,16 +10,16 @@ def main():
     conn.row_factory = sqlite3.Row
 
     # Show current agents
-    rows = conn.execute('SELECT queue_id, status, project_name FROM agent_queue').fetchall()
-    print(f"Found {len(rows)} agents in queue:")
-    for row in rows:
+    (count,) = conn.execute('SELECT COUNT(*) FROM agent_queue').fetchone()
+    print(f"Found {count} agents in queue:")
+    for row in conn.execute('SELECT queue_id, status, project_name FROM agent_queue'):
         print(f"  {row['queue_id']} | {row['status']} | {row['project_name']}")
 
     # If --clear flag, delete all
     if len(sys.argv) > 1 and sys.argv[1] == '--clear':
-        conn.execute('DELETE FROM agent_queue')
+        cursor = conn.execute('DELETE FROM agent_queue')
         conn.commit()
-        print(f"\nCleared all {len(rows)} agents from queue.")
+        print(f"\nCleared all {cursor.rowcount} agents from queue.")
     else:
         print("\nTo clear all, run: python3 check_agents.py --clear")
 
@@ -1,5 +1,7 @@
+import ast
 import os
 import sys
+import shlex
 import shutil
 import subprocess
 import re
@@ -10,10 +12,34 @@ import requests
 from openai import OpenAI
 import json
 import logging
+import hashlib
+import tempfile
+import textwrap
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import Optional
 
 # Configuration
 TEMPLATE_REPO = "https://github.com/bobbyhiddn/Flask2Fly.git"
+# File rewrites are I/O-bound, so use more threads than cores
+FILE_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+# Chat completions are cached on disk so re-running setup with the same
+# inputs skips the API; delete the directory to force fresh answers
+LLM_CACHE_DIR = Path.home() / ".cache" / "legato-pit" / "llm"
+LLM_CACHE_TTL = 7 * 24 * 60 * 60  # seconds
+LOGO_DOWNLOAD_TIMEOUT = 30  # seconds
+
+# Shared so downloads reuse pooled connections instead of a new TLS handshake each
+_HTTP = requests.Session()
+
+# Patterns applied to every file in the generated tree, compiled once
+_NAME_RE = re.compile(r'^[a-zA-Z][a-zA-Z0-9_-]*$')
+_APP_FROM = re.compile(r'from app_name\.')
+_APP_IMPORT = re.compile(r'import app_name\.')
+_FLY_APP = re.compile(r'^app = .*$', re.MULTILINE)
+_DC_SVC = re.compile(r'^  [a-zA-Z0-9_-]*:', re.MULTILINE)
+_BRAND_RE = re.compile(r'FLASK2FLY|Flask2Fly|flask2fly')
 
 class Colors:
     RED = '\033[0;31m'
@@ -31,13 +57,97 @@ def print_error(message: str) -> None:
     print(f"{Colors.RED}✗ {message}{Colors.NC}", file=sys.stderr)
     sys.exit(1)
 
+def rebrand(content: str, project_name: str) -> str:
+    """Replace every casing of the template name with the project name in one pass."""
+    names = {'Flask2Fly': project_name, 'flask2fly': project_name.lower(), 'FLASK2FLY': project_name.upper()}
+    return _BRAND_RE.sub(lambda m: names[m.group(0)], content)
+
+def map_files(func, paths) -> list:
+    """Apply `func` to every path on a thread pool, returning results in order."""
+    with ThreadPoolExecutor(max_workers=FILE_WORKERS) as executor:
+        return list(executor.map(func, paths))
+
+def rewrite_file(path: Path, transform) -> str:
+    """Apply `transform` to a file's text, writing it back only if it changed.
+
+    Bytes that aren't valid UTF-8 pass through unchanged (surrogateescape).
+
+    Returns the updated text.
+    """
+    original = path.read_text(encoding='utf-8', errors='surrogateescape')
+    content = transform(original)
+    if content != original:
+        path.write_text(content, encoding='utf-8', errors='surrogateescape')
+    return content
+
+def cached_chat(client: OpenAI, parse, **kwargs):
+    """Run a chat completion through the on-disk response cache.
+
+    Args:
+        client: OpenAI client used on a cache miss
+        parse: Turns the response text into the caller's result. Responses it
+            rejects by raising are not cached, so a bad answer is never replayed.
+        **kwargs: Arguments for client.chat.completions.create; they form the cache key
+
+    Returns:
+        The parsed response
+    """
+    key = hashlib.blake2b(json.dumps(kwargs, sort_keys=True).encode('utf-8'), digest_size=16).hexdigest()
+    cache_file = LLM_CACHE_DIR / f"{key}.json"
+    try:
+        if time.time() - cache_file.stat().st_mtime < LLM_CACHE_TTL:
+            content = json.loads(cache_file.read_text(encoding='utf-8'))["content"]
+            logging.debug(f"Using cached chat response {key}")
+            return parse(content)
+    except (OSError, ValueError, KeyError):
+        pass
+
+    content = client.chat.completions.create(**kwargs).choices[0].message.content
+    result = parse(content)
+
+    # Write to a temp file and rename so concurrent runs never see a partial entry
+    try:
+        LLM_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=LLM_CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({"content": content}, f)
+        os.replace(tmp_path, cache_file)
+    except OSError as e:
+        logging.debug(f"Could not cache chat response: {e}")
+    return result
+
+def replace_function(content: str, name: str, replacement: str) -> Optional[str]:
+    """Replace the source of the function `name` with `replacement`.
+
+    The function is located by parsing the module, so the edit covers exactly
+    its lines. `replacement` starts at the `def` and is given the original
+    indentation of that line.
+
+    Returns:
+        The updated source, or None if it doesn't parse or has no such function
+    """
+    try:
+        tree = ast.parse(content)
+    except SyntaxError:
+        return None
+
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == name:
+            lines = content.splitlines(keepends=True)
+            first, last = lines[node.lineno - 1], lines[node.end_lineno - 1]
+            indent = first[:len(first) - len(first.lstrip())]
+            newline = last[len(last.rstrip('\r\n')):]
+            lines[node.lineno - 1:node.end_lineno] = [indent + replacement + newline]
+            return "".join(lines)
+    return None
+
 def validate_inputs(project_name: str) -> None:
     if not project_name:
         print("Usage: setup.py <new_project_name> [target_directory]")
         print("Example: setup.py MyNewProject ./projects")
         sys.exit(1)
 
-    if not re.match(r'^[a-zA-Z][a-zA-Z0-9_-]*$', project_name):
+    if not _NAME_RE.match(project_name):
         print_error("Project name must start with a letter and contain only letters, numbers, hyphens, and underscores")
 
 def setup_project_directory(project_dir: Path, project_name: str) -> Path:
@@ -65,49 +175,66 @@ def rename_project_files(project_path: Path, project_name: str) -> None:
         shutil.rmtree(new_app_dir)
     app_dir.rename(new_app_dir)
 
-def update_python_files(project_path: Path, project_name: str) -> None:
-    """Update Python imports and references."""
-    # Update main.py specifically
-    main_py = project_path / "src" / "main.py"
-    if main_py.exists():
-        try:
-            content = main_py.read_text(encoding='utf-8')
-            content = content.replace("from app_name.core", f"from {project_name}.core")
-            main_py.write_text(content, encoding='utf-8')
-        except UnicodeDecodeError:
-            print_status(f"Warning: Could not update {main_py} due to encoding issues")
-
-    # Update all Python files recursively
-    for py_file in project_path.rglob("*.py"):
-        try:
-            content = py_file.read_text(encoding='utf-8')
-            content = re.sub(r'from app_name\.', f'from {project_name}.', content)
-            content = re.sub(r'import app_name\.', f'import {project_name}.', content)
-            content = content.replace("app_name", project_name)
-            py_file.write_text(content, encoding='utf-8')
-        except UnicodeDecodeError:
-            print_status(f"Warning: Could not update {py_file} due to encoding issues")
-
-def generate_theme(project_name: str, project_description: str) -> tuple[dict, bytes]:
-    """Generate a theme and logo using OpenAI APIs."""
+def scan_project(project_path: Path) -> dict:
+    """Walk the project tree once, grouping file paths by extension (e.g. '.py')."""
+    project_files = {}
+    for root, _dirs, files in os.walk(project_path):
+        for name in files:
+            project_files.setdefault(os.path.splitext(name)[1], []).append(Path(root) / name)
+    return project_files
+
+def update_python_files(project_path: Path, project_name: str, contents: Optional[dict] = None,
+                        project_files: Optional[dict] = None) -> None:
+    """Update Python imports and references.
+
+    If `contents` is given, every file's updated text is stored in it by path
+    so later steps can skip re-reading it from disk. `project_files` is the
+    result of scan_project; without it the tree is walked here.
+    """
+    def update_references(content: str) -> str:
+        content = _APP_FROM.sub(f'from {project_name}.', content)
+        content = _APP_IMPORT.sub(f'import {project_name}.', content)
+        return content.replace("app_name", project_name)
+
+    # Update all Python files recursively (main.py included)
+    py_files = project_files.get('.py', []) if project_files is not None else list(project_path.rglob("*.py"))
+    results = map_files(partial(rewrite_file, transform=update_references), py_files)
+    if contents is not None:
+        contents.update(zip(py_files, results))
+
+def download_to_tempfile(response: requests.Response, suffix: str = "") -> Path:
+    """Stream a response body into a temporary file instead of holding it in memory.
+
+    Returns the temporary file's path; the caller moves it into place.
+    """
+    fd, tmp_name = tempfile.mkstemp(suffix=suffix)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            size = int(response.headers.get("content-length") or 0)
+            if size and hasattr(os, "posix_fallocate"):
+                # Reserve the space up front so the file isn't fragmented
+                os.posix_fallocate(f.fileno(), 0, size)
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                f.write(chunk)
+            # Drop any preallocated tail if the decoded body was shorter
+            f.truncate()
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+    return Path(tmp_name)
+
+def generate_theme(project_name: str, project_description: str) -> tuple[dict, Path]:
+    """Generate a theme and logo using OpenAI APIs.
+
+    The logo is returned as the path of a temporary PNG file.
+    """
     api_key = os.getenv('OPENAI_API_KEY')
     if not api_key:
         print_error("OPENAI_API_KEY environment variable is required for theme generation")
 
     client = OpenAI(api_key=api_key)
 
-    try:
-        # Generate color scheme
-        color_response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[{
-                "role": "user",
-                "content": f'Create a modern color scheme for a web application named "{project_name}". Description: {project_description}. Return ONLY a JSON object with these colors in hex format: primary-color, secondary-color, background-color, text-color, text-primary'
-            }],
-            temperature=0.7
-        )
-        
-        raw_content = color_response.choices[0].message.content
+    def parse_colors(raw_content: str) -> dict:
         logging.debug(f"Raw API response: {raw_content}")
         
         try:
@@ -116,12 +243,25 @@ def generate_theme(project_name: str, project_description: str) -> tuple[dict, b
                 clean_content = clean_content.split("\n", 1)[1]
                 clean_content = clean_content.rsplit("\n", 1)[0]
             
-            colors = json.loads(clean_content)
+            return json.loads(clean_content)
         except json.JSONDecodeError as e:
             logging.error(f"JSON parsing error: {e}")
             logging.error(f"Failed to parse response: {raw_content}")
             logging.error(f"Cleaned content: {clean_content}")
             raise Exception("Failed to parse theme colors from API response")
+
+    try:
+        # Generate color scheme
+        colors = cached_chat(
+            client,
+            parse_colors,
+            model="gpt-4o",
+            messages=[{
+                "role": "user",
+                "content": f'Create a modern color scheme for a web application named "{project_name}". Description: {project_description}. Return ONLY a JSON object with these colors in hex format: primary-color, secondary-color, background-color, text-color, text-primary'
+            }],
+            temperature=0.7
+        )
         
         # Generate logo
         image_response = client.images.generate(
@@ -133,32 +273,31 @@ def generate_theme(project_name: str, project_description: str) -> tuple[dict, b
         )
         
         logo_url = image_response.data[0].url
-        logo_response = requests.get(logo_url)
-        if logo_response.status_code != 200:
-            raise Exception("Failed to download generated logo")
+        with _HTTP.get(logo_url, stream=True, timeout=LOGO_DOWNLOAD_TIMEOUT) as logo_response:
+            if logo_response.status_code != 200:
+                raise Exception("Failed to download generated logo")
+            logo_path = download_to_tempfile(logo_response, suffix=".png")
 
-        return colors, logo_response.content
+        return colors, logo_path
     except Exception as e:
         logging.error(f"Failed to generate theme: {str(e)}")
         raise
 
-def update_theme_files(project_path: Path, colors: dict, logo_content: bytes) -> None:
-    """Update theme files with generated content."""
+def update_theme_files(project_path: Path, colors: dict, logo_path: Path) -> None:
+    """Update theme files with generated content, moving the logo file into place."""
     # Save the logo
     static_img_path = project_path / "src" / project_path.name / "static" / "img"
     static_img_path.mkdir(parents=True, exist_ok=True)
-    (static_img_path / "logo.png").write_bytes(logo_content)
+    shutil.move(logo_path, static_img_path / "logo.png")
+    (static_img_path / "logo.png").chmod(0o644)  # mkstemp files are owner-only
 
     # Update CSS with new colors
     css_path = project_path / "src" / project_path.name / "static" / "css" / "styles.css"
-    if css_path.exists():
+    if css_path.exists() and colors:
         css_content = css_path.read_text(encoding='utf-8')
-        for var_name, color in colors.items():
-            css_content = re.sub(
-                f'--{var_name}: #[0-9a-fA-F]{{6}};',
-                f'--{var_name}: {color};',
-                css_content
-            )
+        # One pass over the stylesheet for all variables
+        var_re = re.compile(r'--(' + '|'.join(map(re.escape, colors)) + r'): #[0-9a-fA-F]{6};')
+        css_content = var_re.sub(lambda m: f'--{m.group(1)}: {colors[m.group(1)]};', css_content)
         css_path.write_text(css_content, encoding='utf-8')
 
 def generate_features(project_name: str, project_description: str, client: OpenAI) -> list:
@@ -169,38 +308,40 @@ def generate_features(project_name: str, project_description: str, client: OpenA
 Return ONLY a JSON object with a 'features' key containing an array of exactly 4 features, where each feature has an 'icon' (single emoji), 'title' (2-3 words), and 'description' (10-15 words).
 Features should be specific to the project's purpose."""
 
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[{
-                "role": "user",
-                "content": prompt
-            }],
-            response_format={ "type": "json_object" },
-            temperature=0.7,
-        )
-        
-        # Get the raw response
-        raw_content = response.choices[0].message.content
-        logging.debug(f"Raw GPT features response: {raw_content}")
-        
+        def parse_features(raw_content: str) -> list:
+            logging.debug(f"Raw GPT features response: {raw_content}")
+            try:
+                features = json.loads(raw_content)
+                # If the response is wrapped in a JSON object, extract the features array
+                if isinstance(features, dict) and "features" in features:
+                    features = features["features"]
+                if not isinstance(features, list) or len(features) != 4:
+                    raise ValueError("Invalid features format")
+                
+                # Validate each feature has required fields
+                for feature in features:
+                    if not all(key in feature for key in ["icon", "title", "description"]):
+                        raise ValueError("Features missing required fields")
+                
+                return features
+            except (json.JSONDecodeError, ValueError):
+                logging.error(f"Raw response was: {raw_content}")
+                raise
+
         try:
-            features = json.loads(raw_content)
-            # If the response is wrapped in a JSON object, extract the features array
-            if isinstance(features, dict) and "features" in features:
-                features = features["features"]
-            if not isinstance(features, list) or len(features) != 4:
-                raise ValueError("Invalid features format")
-            
-            # Validate each feature has required fields
-            for feature in features:
-                if not all(key in feature for key in ["icon", "title", "description"]):
-                    raise ValueError("Features missing required fields")
-            
-            return features
-            
+            return cached_chat(
+                client,
+                parse_features,
+                model="gpt-4o",
+                messages=[{
+                    "role": "user",
+                    "content": prompt
+                }],
+                response_format={ "type": "json_object" },
+                temperature=0.7,
+            )
         except (json.JSONDecodeError, ValueError) as e:
             logging.error(f"Failed to parse GPT response: {e}")
-            logging.error(f"Raw response was: {raw_content}")
             return get_fallback_features(project_name)
             
     except Exception as e:
@@ -232,66 +373,57 @@ def get_fallback_features(project_name: str) -> list:
         }
     ]
 
-def update_configuration_files(project_path: Path, project_name: str, project_description: str, client: OpenAI) -> None:
-    """Update various configuration files with the project name."""
-    features = generate_features(project_name, project_description, client)
+def update_configuration_files(project_path: Path, project_name: str, project_description: str, client: OpenAI,
+                               contents: Optional[dict] = None, features: Optional[list] = None,
+                               project_files: Optional[dict] = None) -> None:
+    """Update various configuration files with the project name.
+
+    `contents` is the path-to-text cache filled by update_python_files.
+    `features` are generated with `client` unless the caller already has them.
+    `project_files` is the result of scan_project; without it the templates
+    directory is walked here.
+    """
+    if features is None:
+        features = generate_features(project_name, project_description, client)
     
     # Core configuration files to update
     files_to_update = {
-        "fly.toml": (lambda c: re.sub(r'^app = .*$', f"app = '{project_name}'", c, flags=re.MULTILINE)),
-        "docker-compose.yml": (lambda c: re.sub(r'^  [a-zA-Z0-9_-]*:', f"  {project_name}:", c, flags=re.MULTILINE)),
+        "fly.toml": (lambda c: _FLY_APP.sub(f"app = '{project_name}'", c)),
+        "docker-compose.yml": (lambda c: _DC_SVC.sub(f"  {project_name}:", c)),
         "Dockerfile": (lambda c: c.replace("src/app_name/static", f"src/{project_name}/static")),
         "README.md": (lambda c: c.replace("Flask2Fly", project_name))
     }
 
     # Update base configuration files
-    for filename, update_func in files_to_update.items():
+    def update_config(item: tuple) -> None:
+        filename, update_func = item
         file_path = project_path / filename
         if file_path.exists():
-            try:
-                content = file_path.read_text(encoding='utf-8')
-                updated_content = update_func(content)
-                updated_content = updated_content.replace("Flask2Fly", project_name)
-                updated_content = updated_content.replace("flask2fly", project_name.lower())
-                updated_content = updated_content.replace("FLASK2FLY", project_name.upper())
-                file_path.write_text(updated_content, encoding='utf-8')
-            except UnicodeDecodeError:
-                print_status(f"Warning: Could not update {filename} due to encoding issues")
+            rewrite_file(file_path, lambda c: rebrand(update_func(c), project_name))
+
+    map_files(update_config, files_to_update.items())
 
     # Update core.py with features
     core_file = project_path / "src" / project_name / "core.py"
-    if core_file.exists():
-        try:
-            content = core_file.read_text(encoding='utf-8')
-            
-            # Create new context with features
-            features_list = []
-            for feature in features:
-                features_list.append({
-                    "icon": feature["icon"],
-                    "title": feature["title"],
-                    "description": feature["description"]
-                })
-            
-            # Format the features JSON with proper indentation
-            features_lines = []
-            features_lines.append("[")
-            for i, feature in enumerate(features_list):
-                feature_json = json.dumps(feature, indent=4, ensure_ascii=False)
-                # Indent each line of the feature
-                feature_lines = feature_json.splitlines()
-                for j, line in enumerate(feature_lines):
-                    if j == 0:  # First line
-                        features_lines.append("                    " + line)
-                    else:
-                        features_lines.append("                        " + line.lstrip())
-                if i < len(features_list) - 1:
-                    features_lines[-1] += ","
-            features_lines.append("                ]")
-            features_json = "\n".join(features_lines)
-            
-            # Create a properly indented return statement
-            context_str = """            return {
+    cached_core = (contents or {}).get(core_file)
+    if cached_core is not None or core_file.exists():
+        content = (cached_core if cached_core is not None
+                   else core_file.read_text(encoding='utf-8', errors='surrogateescape'))
+        
+        # Create new context with features
+        features_list = []
+        for feature in features:
+            features_list.append({
+                "icon": feature["icon"],
+                "title": feature["title"],
+                "description": feature["description"]
+            })
+        
+        # Format the features JSON to sit under 'key_features' in the return dict
+        features_json = textwrap.indent(json.dumps(features_list, indent=4, ensure_ascii=False), " " * 16).lstrip()
+        
+        # Create a properly indented return statement
+        context_str = """            return {
                 'now': datetime.datetime.now(),
                 'site_name': '%s',
                 'app_name': '%s',
@@ -301,46 +433,39 @@ def update_configuration_files(project_path: Path, project_name: str, project_de
                 'docs_url': f'https://github.com/yourusername/%s/docs',
                 'key_features': %s
             }""" % (
-                project_name,
-                project_name,
-                project_description,
-                project_description,
-                project_name,
-                project_name,
-                features_json
-            )
-            
-            # Find the inject_globals function and replace its entire content
-            inject_pattern = r'def inject_globals\(\):[\s\S]*?return\s*{[\s\S]*?key_features[\s\S]*?\][\s\S]*?}'
-            
-            replacement = f"""def inject_globals():
+            project_name,
+            project_name,
+            project_description,
+            project_description,
+            project_name,
+            project_name,
+            features_json
+        )
+        
+        # Find the inject_globals function and replace its entire content
+        replacement = f"""def inject_globals():
             \"\"\"Make common variables available to all templates\"\"\"
 {context_str}"""
-            
-            # Use re.sub with re.MULTILINE and re.DOTALL flags
-            content = re.sub(inject_pattern, replacement, content, flags=re.MULTILINE | re.DOTALL)
-            
-            # Update other references
-            content = content.replace("Flask2Fly", project_name)
-            content = content.replace("flask2fly", project_name.lower())
-            
-            core_file.write_text(content, encoding='utf-8')
-        except UnicodeDecodeError:
-            print_status(f"Warning: Could not update {core_file} due to encoding issues")
+        
+        updated = replace_function(content, "inject_globals", replacement)
+        if updated is None:
+            print_status(f"Warning: Could not find inject_globals() in {core_file}; features were not injected")
+        else:
+            content = updated
+        
+        # Update other references
+        content = rebrand(content, project_name)
+        
+        core_file.write_text(content, encoding='utf-8', errors='surrogateescape')
 
     # Update templates and HTML files
     template_dir = project_path / "src" / project_name / "templates"
     if template_dir.exists():
-        for template in template_dir.glob("**/*.html"):
-            try:
-                content = template.read_text(encoding='utf-8')
-                content = content.replace("Flask2Fly", project_name)
-                content = content.replace("flask2fly", project_name.lower())
-                content = content.replace("FLASK2FLY", project_name.upper())
-                content = content.replace("flask2fly logo", f"{project_name.lower()} logo")
-                template.write_text(content, encoding='utf-8')
-            except UnicodeDecodeError:
-                print_status(f"Warning: Could not update {template} due to encoding issues")
+        if project_files is not None:
+            templates = [path for path in project_files.get('.html', []) if template_dir in path.parents]
+        else:
+            templates = list(template_dir.glob("**/*.html"))
+        map_files(partial(rewrite_file, transform=partial(rebrand, project_name=project_name)), templates)
 
 def initialize_modules(project_path: Path) -> None:
     """Initialize local module directories."""
@@ -348,9 +473,6 @@ def initialize_modules(project_path: Path) -> None:
     pages_dir = modules_dir / "pages"
     pages_dir.mkdir(parents=True, exist_ok=True)
 
-    # Initialize pages as a local Git repository
-    subprocess.run(["git", "init"], cwd=pages_dir, check=True)
-    
     # Create basic structure
     for subdir in ["docs", "articles", "templates"]:
         (pages_dir / subdir).mkdir(exist_ok=True)
@@ -402,22 +524,41 @@ To synchronize with a remote repository:
 """
     (pages_dir / "README.md").write_text(readme_content, encoding='utf-8')
 
-    # Initial commit
-    subprocess.run(["git", "add", "."], cwd=pages_dir, check=True)
-    subprocess.run(
+    # Initialize pages as a local Git repository with an initial commit. On
+    # POSIX a single shell runs the whole sequence instead of one spawn per command
+    git_env = {**os.environ, 'GIT_AUTHOR_NAME': 'Setup Script', 'GIT_AUTHOR_EMAIL': 'setup@local'}
+    git_commands = [
+        ["git", "init"],
+        ["git", "add", "."],
         ["git", "commit", "-m", "Initial pages module setup"],
-        cwd=pages_dir,
-        env={**os.environ, 'GIT_AUTHOR_NAME': 'Setup Script', 'GIT_AUTHOR_EMAIL': 'setup@local'},
-        check=True
-    )
+    ]
+    if os.name == 'nt':
+        for command in git_commands:
+            subprocess.run(command, cwd=pages_dir, env=git_env, check=True)
+    else:
+        script = " && ".join(shlex.join(command) for command in git_commands)
+        subprocess.run(["sh", "-c", script], cwd=pages_dir, env=git_env, check=True)
 
 def setup_virtual_environment(project_path: Path) -> None:
     """Set up and configure the virtual environment."""
     venv_path = project_path / "venv"
+    requirements_path = project_path / "src" / "requirements.txt"
+
+    # uv seeds pip from its cache instead of running ensurepip and installs packages in parallel;
+    # --seed keeps pip in the venv so it matches the venv.create() fallback below
+    uv_path = shutil.which("uv")
+    if uv_path:
+        python_path = venv_path / "bin" / "python" if os.name != 'nt' else venv_path / "Scripts" / "python.exe"
+        subprocess.run([uv_path, "venv", "--seed", str(venv_path)], check=True)
+        subprocess.run(
+            [uv_path, "pip", "install", "--python", str(python_path), "-r", str(requirements_path)],
+            check=True
+        )
+        return
+
     venv.create(venv_path, with_pip=True)
     
     pip_path = venv_path / "bin" / "pip" if os.name != 'nt' else venv_path / "Scripts" / "pip"
-    requirements_path = project_path / "src" / "requirements.txt"
     
     subprocess.run(
         [str(pip_path), "install", "-r", str(requirements_path)],
@@ -429,7 +570,8 @@ def setup_git_hooks(project_path: Path) -> None:
     hooks_dir = project_path / ".git" / "hooks"
     hooks_dir.mkdir(parents=True, exist_ok=True)
     
-    shutil.copy2(
+    # Only the bytes matter; the mode is set explicitly below
+    shutil.copyfile(
         project_path / "utils" / "pre-push",
         hooks_dir / "pre-push"
     )
@@ -451,49 +593,49 @@ def initialize_project(project_path: Path) -> None:
     setup_virtual_environment(project_path)
     setup_git_hooks(project_path)
 
+def remove_tree(path: str) -> None:
+    """Delete a directory tree bottom-up in a single scandir pass.
+
+    Read-only files (git objects on Windows) are made writable and retried.
+    Errors on individual entries are ignored, so the caller should check
+    whether the directory is gone afterwards.
+    """
+    with os.scandir(path) as entries:
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    remove_tree(entry.path)
+                else:
+                    try:
+                        os.unlink(entry.path)
+                    except PermissionError:
+                        os.chmod(entry.path, stat.S_IWRITE)
+                        os.unlink(entry.path)
+            except OSError:
+                pass
+    os.rmdir(path)
+
 def safe_remove_git_dir(path: Path) -> None:
     """Safely remove a git directory on Windows."""
     if not path.exists():
         return
 
-    def on_rm_error(func, path, exc_info):
-        try:
-            os.chmod(path, stat.S_IWRITE)
-            os.unlink(path)
-        except Exception:
-            pass
-
     try:
-        # Clean the git repo first
+        remove_tree(str(path))
+    except OSError:
+        pass
+
+    # Last resort: use system commands
+    if path.exists():
         try:
-            subprocess.run(["git", "clean", "-fd"], cwd=path, check=False, capture_output=True)
-            subprocess.run(["git", "gc"], cwd=path, check=False, capture_output=True)
+            if os.name == 'nt':
+                subprocess.run(['rmdir', '/S', '/Q', str(path)], check=False, capture_output=True)
+            else:
+                subprocess.run(['rm', '-rf', str(path)], check=False, capture_output=True)
         except Exception:
             pass
 
-        # Try standard removal first
-        shutil.rmtree(path, onerror=on_rm_error)
-        
-        # If directory still exists, try more aggressive cleanup
-        if path.exists():
-            for p in path.rglob('*'):
-                try:
-                    p.chmod(stat.S_IWRITE)
-                except Exception:
-                    pass
-            shutil.rmtree(path, ignore_errors=True)
-        
-        # Last resort: use system commands
-        if path.exists():
-            try:
-                if os.name == 'nt':
-                    subprocess.run(['rmdir', '/S', '/Q', str(path)], check=False, capture_output=True)
-                else:
-                    subprocess.run(['rm', '-rf', str(path)], check=False, capture_output=True)
-            except Exception:
-                pass
-
-    except Exception as e:
+    if path.exists():
         print_status(f"Warning: Could not fully clean up {path}. You may want to remove it manually.")
 
 def main() -> None:
@@ -511,58 +653,52 @@ def main() -> None:
     print_status(f"Starting project setup for {project_name}")
     
     validate_inputs(project_name)
-    project_path = setup_project_directory(project_dir, project_name)
-    
-    print_status("Cloning Flask2Fly template...")
     
-    # Create temporary directory for cloning
-    temp_clone_path = Path("..") / "temp_clone"
-    
-    # Clean up existing temp_clone directory if it exists
-    if temp_clone_path.exists():
-        try:
-            shutil.rmtree(temp_clone_path)
-        except Exception as e:
-            safe_remove_git_dir(temp_clone_path)
+    # Check the key before touching the disk or network so a bad key fails in
+    # well under a second instead of after the clone and file rewrites
+    api_key = os.getenv('OPENAI_API_KEY')
+    if not api_key:
+        print_error("OPENAI_API_KEY environment variable is required for theme generation")
     
-    subprocess.run(["git", "clone", TEMPLATE_REPO, str(temp_clone_path)], check=True)
+    client = OpenAI(api_key=api_key)
+    try:
+        client.models.list()
+    except Exception as e:
+        print_error(f"OPENAI_API_KEY was rejected by OpenAI: {e}")
     
-    # Move contents to actual project directory
-    project_path.mkdir(parents=True, exist_ok=True)
+    project_path = setup_project_directory(project_dir, project_name)
     
-    # Copy everything except .git
-    for item in temp_clone_path.iterdir():
-        if item.name != '.git':
-            if item.is_dir():
-                shutil.copytree(str(item), str(project_path / item.name), dirs_exist_ok=True)
-            else:
-                shutil.copy2(str(item), str(project_path))
+    print_status("Cloning Flask2Fly template...")
     
-    # Clean up temporary directory
-    safe_remove_git_dir(temp_clone_path)
+    # Shallow-clone straight into the project directory, then drop the
+    # template's git metadata so initialize_project starts a fresh repository
+    subprocess.run(["git", "clone", "--depth=1", TEMPLATE_REPO, str(project_path)], check=True)
+    safe_remove_git_dir(project_path / ".git")
     
     # Change to project directory for remaining operations
     os.chdir(project_path)
     
-    # Perform all updates
-    rename_project_files(project_path, project_name)
-    update_python_files(project_path, project_name)
-    
-    api_key = os.getenv('OPENAI_API_KEY')
-    if not api_key:
-        print_error("OPENAI_API_KEY environment variable is required for theme generation")
-    
-    client = OpenAI(api_key=api_key)
+    # The OpenAI calls take seconds each; run them in the background while
+    # the project files are rewritten and the virtualenv is installed
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        features_future = executor.submit(generate_features, project_name, project_description, client)
+        print_status("Generating custom theme and logo...")
+        theme_future = executor.submit(generate_theme, project_name, project_description)
     
-    update_configuration_files(project_path, project_name, project_description, client)
-    initialize_modules(project_path)
-    initialize_project(project_path)
+        # Perform all updates
+        rename_project_files(project_path, project_name)
+        project_files = scan_project(project_path)
+        file_contents = {}
+        update_python_files(project_path, project_name, file_contents, project_files)
+        update_configuration_files(project_path, project_name, project_description, client, file_contents,
+                                   features=features_future.result(), project_files=project_files)
+        initialize_modules(project_path)
+        initialize_project(project_path)
     
-    # Generate and apply theme
-    print_status("Generating custom theme and logo...")
-    colors, logo_content = generate_theme(project_name, project_description)
-    update_theme_files(project_path, colors, logo_content)
-    print_success("Theme and logo generated successfully!")
+        # Apply the generated theme
+        colors, logo_path = theme_future.result()
+        update_theme_files(project_path, colors, logo_path)
+        print_success("Theme and logo generated successfully!")
     
     print_success(f"Project '{project_name}' has been successfully created!")
     print_status("Next steps:")